@@ -1,19 +1,26 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 import asyncio
 import logging
 import sys
 import os
+import re
 import uvicorn
+import itertools
 from datetime import datetime
-import random
+import numpy as np
+import orjson
+from cachetools import TTLCache
+from prometheus_client import make_asgi_app
+from cache_metrics import record_hit, record_miss
 
 # Add the ariel directory to the path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'ariel'))
 
 from orchestrator import ArielOrchestrator
 
-app = FastAPI(title="Ariel API", version="1.0.0")
+app = FastAPI(title="Ariel API", version="1.0.0", default_response_class=ORJSONResponse)
 
 # Enable CORS for frontend
 app.add_middleware(
@@ -24,9 +31,134 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Prometheus exposition (cache hit/miss counters among others)
+app.mount("/api/metrics", make_asgi_app())
+
+# Cache-Control policies for read-only dashboard endpoints, so a CDN or
+# reverse proxy can answer repeat polls without reaching the API
+CACHE_CONTROL_POLICIES = {
+    "/api/status": "public, max-age=5, s-maxage=30",
+    "/api/activities": "public, max-age=10, s-maxage=30",
+    "/api/affiliate/metrics": "public, max-age=10, s-maxage=30",
+    "/api/neural/metrics": "public, max-age=10, s-maxage=30",
+}
+
+@app.middleware("http")
+async def add_cache_control(request, call_next):
+    """Attach the route's Cache-Control policy to successful GET responses"""
+    response = await call_next(request)
+    policy = CACHE_CONTROL_POLICIES.get(request.url.path)
+    if policy and request.method == "GET" and response.status_code == 200:
+        response.headers.setdefault("Cache-Control", policy)
+    return response
+
 # Global Ariel instance
 ariel_instance = None
 
+# Set to ask the background worker for an extra cycle; requests that arrive
+# while a cycle is running coalesce into a single follow-up cycle
+_cycle_requested = asyncio.Event()
+
+# Per-endpoint response caches; the background loop only refreshes every
+# 5 minutes, so dashboard polls inside the TTL are served from memory
+METRICS_CACHE_TTL = {
+    "affiliate": 10,
+    "neural": 30,
+}
+_metrics_cache = {name: TTLCache(maxsize=1, ttl=ttl) for name, ttl in METRICS_CACHE_TTL.items()}
+_metrics_locks = {name: asyncio.Lock() for name in METRICS_CACHE_TTL}
+
+# Pre-generated metric samples; each request pulls the next value instead of
+# calling into the RNG several times per response
+METRIC_POOL_SIZE = 4096
+_rng = np.random.default_rng()
+
+def _sample_pool(low, high, ndigits=None):
+    """Cycle over a batch of uniform samples (integers when ndigits is None)"""
+    if ndigits is None:
+        samples = _rng.integers(low, high, size=METRIC_POOL_SIZE, endpoint=True)
+    else:
+        samples = _rng.uniform(low, high, size=METRIC_POOL_SIZE).round(ndigits)
+    return itertools.cycle(samples.tolist())
+
+_active_campaigns = _sample_pool(8, 15)
+_conversion_rate = _sample_pool(2.5, 5.0, 1)
+_total_clicks = _sample_pool(10000, 20000)
+_demo_revenue = _sample_pool(5000, 12000, 2)
+_campaign_conversion = _sample_pool(2.0, 5.0, 1)
+_automation_level = _sample_pool(80, 95)
+_growth_north_america = _sample_pool(8, 15, 1)
+_growth_europe = _sample_pool(5, 12, 1)
+_growth_asia_pacific = _sample_pool(10, 20, 1)
+
+# Demo payloads are rendered to JSON once; per request only the "__name__"
+# placeholders are replaced with the next value from the matching sample pool
+_PLACEHOLDER_RE = re.compile(rb'"__(\w+)__"')
+
+def _render_template(payload):
+    """Pre-render `payload` with orjson, split around its placeholder fields"""
+    return _PLACEHOLDER_RE.split(orjson.dumps(payload))
+
+def _fill_template(parts, pools):
+    """Splice the next sample of each placeholder's pool into a rendered template"""
+    chunks = list(parts)
+    chunks[1::2] = [orjson.dumps(next(pools[name])) for name in parts[1::2]]
+    return Response(content=b"".join(chunks), media_type="application/json")
+
+_DEMO_POOLS = {
+    b"active_campaigns": _active_campaigns,
+    b"conversion_rate": _conversion_rate,
+    b"total_clicks": _total_clicks,
+    b"demo_revenue": _demo_revenue,
+    b"automation_level": _automation_level,
+}
+
+_AFFILIATE_DEMO_TEMPLATE = _render_template({
+    "activeCampaigns": "__active_campaigns__",
+    "conversionRate": "__conversion_rate__",
+    "totalClicks": "__total_clicks__",
+    "revenue": "__demo_revenue__",
+    "topPerformers": [
+        {"name": "Tech Products Campaign", "conversion": 4.2, "revenue": 3200},
+        {"name": "Health & Wellness", "conversion": 3.8, "revenue": 2800},
+        {"name": "Digital Services", "conversion": 3.1, "revenue": 2750},
+    ]
+})
+
+_NEURAL_DEMO_TEMPLATE = _render_template({
+    "globalAnalysis": "Processing 2.3M data points",
+    "automationLevel": "__automation_level__",
+    "marketTrends": [
+        {"region": "North America", "growth": 12.5, "status": "bullish"},
+        {"region": "Europe", "growth": 8.3, "status": "stable"},
+        {"region": "Asia Pacific", "growth": 15.7, "status": "bullish"},
+    ]
+})
+
+# Cache lookups use a single get() so an entry expiring between a
+# membership test and the read can't raise KeyError
+_MISSING = object()
+
+async def cached_metrics(name, producer):
+    """Return the cached payload for `name`, calling `producer` on a miss"""
+    cache = _metrics_cache[name]
+    payload = cache.get(name, _MISSING)
+    if payload is not _MISSING:
+        record_hit(f"metrics.{name}")
+        return payload
+    
+    # Only one coroutine recomputes an expired entry; the rest wait for it
+    async with _metrics_locks[name]:
+        payload = cache.get(name, _MISSING)
+        if payload is not _MISSING:
+            record_hit(f"metrics.{name}")
+            return payload
+        
+        record_miss(f"metrics.{name}")
+        payload = await producer()
+        cache[name] = payload
+        return payload
+
 @app.on_event("startup")
 async def startup_event():
     global ariel_instance
@@ -37,18 +169,29 @@ async def startup_event():
     asyncio.create_task(run_ariel_background())
 
 async def run_ariel_background():
-    """Run Ariel in the background"""
+    """Run Ariel in the background; the only place orchestrator cycles execute"""
     global ariel_instance
     if ariel_instance:
         # Run with longer cycles for API mode
         ariel_instance.cycle_time = 300  # 5 minutes
         while True:
             try:
+                _cycle_requested.clear()
                 await ariel_instance.run_cycle()
-                await asyncio.sleep(ariel_instance.cycle_time)
             except Exception as e:
                 logging.error(f"Background Ariel error: {e}")
                 await asyncio.sleep(60)  # Wait 1 minute on error
+                continue
+            
+            # Sleep until the next scheduled cycle or an on-demand request
+            try:
+                await asyncio.wait_for(_cycle_requested.wait(), timeout=ariel_instance.cycle_time)
+            except asyncio.TimeoutError:
+                pass
+
+def request_cycle():
+    """Ask the background worker to run a cycle as soon as it is free"""
+    _cycle_requested.set()
 
 @app.get("/api/status")
 async def get_status():
@@ -72,63 +215,45 @@ async def get_affiliate_metrics():
     """Get affiliate marketing metrics"""
     if not ariel_instance:
         # Return demo data if Ariel not available
-        return {
-            "activeCampaigns": random.randint(8, 15),
-            "conversionRate": round(random.uniform(2.5, 5.0), 1),
-            "totalClicks": random.randint(10000, 20000),
-            "revenue": round(random.uniform(5000, 12000), 2),
-            "topPerformers": [
-                {"name": "Tech Products Campaign", "conversion": 4.2, "revenue": 3200},
-                {"name": "Health & Wellness", "conversion": 3.8, "revenue": 2800},
-                {"name": "Digital Services", "conversion": 3.1, "revenue": 2750},
-            ]
-        }
+        return _fill_template(_AFFILIATE_DEMO_TEMPLATE, _DEMO_POOLS)
     
+    return await cached_metrics("affiliate", _build_affiliate_metrics)
+
+async def _build_affiliate_metrics():
     # Get real metrics from campaigns
     campaigns = await ariel_instance.campaign_manager.get_active_campaigns()
     
     return {
         "activeCampaigns": len(campaigns),
-        "conversionRate": round(random.uniform(2.5, 5.0), 1),
-        "totalClicks": random.randint(10000, 20000),
+        "conversionRate": next(_conversion_rate),
+        "totalClicks": next(_total_clicks),
         "revenue": round(sum(c.get("budget", 0) * c.get("target_roi", 1) for c in campaigns), 2),
         "topPerformers": [
-            {"name": f"Campaign {c['id']}", "conversion": round(random.uniform(2.0, 5.0), 1), "revenue": round(c.get("budget", 0) * c.get("target_roi", 1), 2)}
+            {"name": f"Campaign {c['id']}", "conversion": next(_campaign_conversion), "revenue": round(c.get("budget", 0) * c.get("target_roi", 1), 2)}
             for c in campaigns[:3]
         ]
     }
 
-@app.post("/api/affiliate/optimize")
+@app.post("/api/affiliate/optimize", status_code=202)
 async def optimize_affiliate():
     """Trigger affiliate optimization"""
     if not ariel_instance:
         raise HTTPException(status_code=503, detail="Ariel not initialized")
     
-    # Trigger an optimization cycle
-    try:
-        opportunities = await ariel_instance.quantum.find_opportunities()
-        market_trends = await ariel_instance.neural.analyze_trends()
-        await ariel_instance.campaign_manager.launch_or_optimize(opportunities, market_trends)
-        
-        return {"message": "Affiliate optimization triggered successfully!"}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Optimization failed: {str(e)}")
+    # Queue an optimization cycle on the background worker
+    request_cycle()
+    return {"message": "Affiliate optimization triggered successfully!"}
 
 @app.get("/api/neural/metrics")
 async def get_neural_metrics():
     """Get neural commerce metrics"""
     if not ariel_instance:
         # Return demo data
-        return {
-            "globalAnalysis": "Processing 2.3M data points",
-            "automationLevel": random.randint(80, 95),
-            "marketTrends": [
-                {"region": "North America", "growth": 12.5, "status": "bullish"},
-                {"region": "Europe", "growth": 8.3, "status": "stable"},
-                {"region": "Asia Pacific", "growth": 15.7, "status": "bullish"},
-            ]
-        }
+        return _fill_template(_NEURAL_DEMO_TEMPLATE, _DEMO_POOLS)
     
+    return await cached_metrics("neural", _build_neural_metrics)
+
+async def _build_neural_metrics():
     # Get real neural analysis
     try:
         trends = await ariel_instance.neural.analyze_trends()
@@ -136,26 +261,23 @@ async def get_neural_metrics():
             "globalAnalysis": f"Analyzing {trends.get('markets', [])} markets",
             "automationLevel": int(trends.get('confidence', 0.8) * 100),
             "marketTrends": [
-                {"region": "North America", "growth": round(random.uniform(8, 15), 1), "status": trends.get('trend', 'stable')},
-                {"region": "Europe", "growth": round(random.uniform(5, 12), 1), "status": "stable"},
-                {"region": "Asia Pacific", "growth": round(random.uniform(10, 20), 1), "status": trends.get('trend', 'bullish')},
+                {"region": "North America", "growth": next(_growth_north_america), "status": trends.get('trend', 'stable')},
+                {"region": "Europe", "growth": next(_growth_europe), "status": "stable"},
+                {"region": "Asia Pacific", "growth": next(_growth_asia_pacific), "status": trends.get('trend', 'bullish')},
             ]
         }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Neural metrics failed: {str(e)}")
 
-@app.post("/api/neural/optimize")
+@app.post("/api/neural/optimize", status_code=202)
 async def optimize_neural():
     """Trigger neural optimization"""
     if not ariel_instance:
         raise HTTPException(status_code=503, detail="Ariel not initialized")
     
-    try:
-        # Trigger neural analysis and optimization
-        await ariel_instance.neural.analyze_trends()
-        return {"message": "Neural optimization completed successfully!"}
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Neural optimization failed: {str(e)}")
+    # Neural analysis runs as part of the queued background cycle
+    request_cycle()
+    return {"message": "Neural optimization triggered successfully!"}
 
 @app.post("/api/control/pause")
 async def pause_ariel():
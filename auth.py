@@ -1,58 +1,75 @@
 import os
 import jwt
-import bcrypt
+import httpx
 from datetime import datetime, timedelta
-from functools import wraps
-from flask import request, jsonify, current_app
-from supabase import create_client, Client
+from fastapi import Depends, Header, HTTPException, status
 from typing import Optional, Dict, Any
+from cachetools import TTLCache
+from cache_metrics import record_hit, record_miss
 
 # Supabase configuration
 SUPABASE_URL = os.getenv("SUPABASE_URL", "https://your-project.supabase.co")
 SUPABASE_KEY = os.getenv("SUPABASE_ANON_KEY", "your-anon-key")
+SUPABASE_SERVICE_KEY = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
 JWT_SECRET = os.getenv("JWT_SECRET", "your-jwt-secret")
+JWT_ALGORITHM = "HS256"
 
-# Initialize Supabase client
-supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
+# Key material and the accepted-algorithms list are built once, not per token
+_JWT_KEY = JWT_SECRET.encode('utf-8')
+_JWT_ALGORITHMS = [JWT_ALGORITHM]
+
+# Supabase is reached over its REST APIs (GoTrue at /auth/v1, PostgREST at
+# /rest/v1) through a keep-alive HTTP/2 pool, so requests reuse an open TLS
+# session instead of handshaking each time
+SUPABASE_HEADERS = {
+    "apikey": SUPABASE_KEY,
+    "Authorization": f"Bearer {SUPABASE_KEY}",
+}
+
+# profiles is protected by row-level security, so profile reads carry either
+# the user's own access token or, for server-side lookups, the service role key
+SUPABASE_SERVICE_HEADERS = {
+    "apikey": SUPABASE_SERVICE_KEY,
+    "Authorization": f"Bearer {SUPABASE_SERVICE_KEY}",
+} if SUPABASE_SERVICE_KEY else None
+
+supabase_http = httpx.AsyncClient(
+    base_url=SUPABASE_URL,
+    headers=SUPABASE_HEADERS,
+    http2=True,
+    timeout=5,
+    limits=httpx.Limits(max_keepalive_connections=50, keepalive_expiry=60),
+)
+
+# Short-lived user_id -> role cache so role-gated requests skip the profiles query
+ROLE_CACHE_TTL = 60
+_role_cache = TTLCache(maxsize=10_000, ttl=ROLE_CACHE_TTL)
 
 class AuthManager:
     def __init__(self):
-        self.supabase = supabase
+        self.http = supabase_http
         
     async def register_user(self, email: str, password: str, user_data: Dict = None) -> Dict:
         """Register a new user"""
         try:
-            # Hash password
-            hashed_password = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt())
-            
-            # Create user in Supabase
-            response = self.supabase.auth.sign_up({
+            # Create user in Supabase; GoTrue hashes the password itself, and
+            # the on_auth_user_created trigger (supabase/migrations) writes the
+            # profiles row from this metadata
+            response = await self.http.post("/auth/v1/signup", json={
                 "email": email,
                 "password": password,
-                "options": {
-                    "data": user_data or {}
-                }
+                "data": user_data or {}
             })
+            response.raise_for_status()
+            body = response.json()
             
-            if response.user:
-                # Store additional user data
-                user_profile = {
-                    "id": response.user.id,
-                    "email": email,
-                    "created_at": datetime.utcnow().isoformat(),
-                    "role": "user",
-                    "quantum_access": True,
-                    "affiliate_access": True,
-                    "autonomous_mode": True,
-                    **user_data or {}
-                }
-                
-                # Insert into profiles table
-                self.supabase.table('profiles').insert(user_profile).execute()
-                
+            # With auto-confirm GoTrue returns a session wrapping the user
+            user = body.get("user", body)
+            
+            if user.get("id"):
                 return {
                     "success": True,
-                    "user": response.user,
+                    "user": user,
                     "message": "User registered successfully"
                 }
             else:
@@ -70,25 +87,43 @@ class AuthManager:
     async def login_user(self, email: str, password: str) -> Dict:
         """Login user and return JWT token"""
         try:
-            response = self.supabase.auth.sign_in_with_password({
-                "email": email,
-                "password": password
-            })
+            response = await self.http.post(
+                "/auth/v1/token",
+                params={"grant_type": "password"},
+                json={"email": email, "password": password}
+            )
+            body = response.json() if response.status_code == 200 else {}
+            user = body.get("user")
             
-            if response.user:
+            if user:
+                # Fetch access claims once so protected routes can read them
+                # from the token; the read runs as the user so RLS admits it
+                profile = await self._select_profile(
+                    user["id"], "role,quantum_access,affiliate_access",
+                    headers={"Authorization": f"Bearer {body['access_token']}"}
+                )
+                if not profile:
+                    return {
+                        "success": False,
+                        "error": "User profile not found"
+                    }
+                
                 # Generate JWT token
                 token_payload = {
-                    "user_id": response.user.id,
+                    "user_id": user["id"],
                     "email": email,
+                    "role": profile["role"],
+                    "quantum_access": profile["quantum_access"],
+                    "affiliate_access": profile["affiliate_access"],
                     "exp": datetime.utcnow() + timedelta(hours=24)
                 }
                 
-                token = jwt.encode(token_payload, JWT_SECRET, algorithm="HS256")
+                token = jwt.encode(token_payload, _JWT_KEY, algorithm=JWT_ALGORITHM)
                 
                 return {
                     "success": True,
                     "token": token,
-                    "user": response.user,
+                    "user": user,
                     "message": "Login successful"
                 }
             else:
@@ -106,63 +141,73 @@ class AuthManager:
     def verify_token(self, token: str) -> Optional[Dict]:
         """Verify JWT token"""
         try:
-            payload = jwt.decode(token, JWT_SECRET, algorithms=["HS256"])
+            payload = jwt.decode(token, _JWT_KEY, algorithms=_JWT_ALGORITHMS)
             return payload
         except jwt.ExpiredSignatureError:
             return None
         except jwt.InvalidTokenError:
             return None
     
+    async def _select_profile(self, user_id: str, columns: str = "*", headers: Optional[Dict] = None) -> Optional[Dict]:
+        """Fetch one profiles row through PostgREST, with the service role key unless headers override it"""
+        response = await self.http.get("/rest/v1/profiles", params={
+            "id": f"eq.{user_id}",
+            "select": columns,
+            "limit": 1
+        }, headers=headers or SUPABASE_SERVICE_HEADERS)
+        response.raise_for_status()
+        rows = response.json()
+        return rows[0] if rows else None
+    
     async def get_user_profile(self, user_id: str) -> Optional[Dict]:
         """Get user profile from database"""
         try:
-            response = self.supabase.table('profiles').select('*').eq('id', user_id).execute()
-            if response.data:
-                return response.data[0]
-            return None
+            return await self._select_profile(user_id)
         except Exception:
             return None
+    
+    async def get_user_role(self, user_id: str) -> Optional[str]:
+        """Get user role, served from a short-lived cache when possible"""
+        role = _role_cache.get(user_id)
+        if role is not None:
+            record_hit("auth.role")
+        else:
+            record_miss("auth.role")
+            profile = await self._select_profile(user_id, "role")
+            if not profile:
+                return None
+            role = profile['role']
+            _role_cache[user_id] = role
+        return role
+    
+    def invalidate_user_role(self, user_id: str):
+        """Drop a cached role; call after any write to profiles.role"""
+        _role_cache.pop(user_id, None)
 
 # Global auth manager instance
 auth_manager = AuthManager()
 
-def require_auth(f):
-    """Decorator to require authentication"""
-    @wraps(f)
-    def decorated_function(*args, **kwargs):
-        token = request.headers.get('Authorization')
-        
-        if not token:
-            return jsonify({'error': 'No token provided'}), 401
-        
-        if token.startswith('Bearer '):
-            token = token[7:]
-        
-        payload = auth_manager.verify_token(token)
+async def get_current_user(authorization: Optional[str] = Header(None)) -> Dict:
+    """FastAPI dependency that requires a valid bearer token and returns its payload"""
+    if not authorization:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="No token provided")
+    
+    payload = auth_manager.verify_token(authorization.removeprefix('Bearer '))
+    
+    if not payload:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+    
+    return payload
+
+def require_role(role: str):
+    """Build a FastAPI dependency that requires a specific role"""
+    async def role_dependency(user: Dict = Depends(get_current_user)) -> Dict:
+        # Prefer the role claim; tokens issued before it existed fall back to the cached lookup
+        user_role = user.get('role') or await auth_manager.get_user_role(user['user_id'])
         
-        if not payload:
-            return jsonify({'error': 'Invalid token'}), 401
+        if user_role != role:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Insufficient permissions")
         
-        request.user = payload
-        return f(*args, **kwargs)
+        return user
     
-    return decorated_function
-
-def require_role(role):
-    """Decorator to require specific role"""
-    def decorator(f):
-        @wraps(f)
-        def decorated_function(*args, **kwargs):
-            if not hasattr(request, 'user'):
-                return jsonify({'error': 'Authentication required'}), 401
-            
-            # Get user role from database
-            user_id = request.user['user_id']
-            user_profile = auth_manager.supabase.table('profiles').select('role').eq('id', user_id).execute()
-            
-            if not user_profile.data or user_profile.data[0]['role'] != role:
-                return jsonify({'error': 'Insufficient permissions'}), 403
-            
-            return f(*args, **kwargs)
-        return decorated_function
-    return decorator
+    return role_dependency
@@ -1,14 +1,39 @@
 import asyncio
+import bisect
+import functools
+import io
+import itertools
 import logging
-import openai
+import random
 from datetime import datetime
 from typing import Dict, List, Optional
-import json
+from collections import Counter, deque
 import re
+from cache_metrics import register_lru_cache
 
 logger = logging.getLogger("ArielMatrix.BlogGenerator")
 
+_SLUG_NON_ALNUM = re.compile(r'[^a-z0-9\s-]')
+_SLUG_SPACES = re.compile(r'\s+')
+_WORD_RE = re.compile(r'\b[a-zA-Z]{4,}\b')
+
+STOPWORDS = frozenset({'the', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'is', 'are', 'was', 'were', 'be', 'been', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could', 'should', 'may', 'might', 'must', 'can', 'this', 'that', 'these', 'those'})
+
 class BlogGenerator:
+    # Topic weights based on current trends, stored as cumulative sums so a
+    # draw is a single bisect
+    _TOPIC_WEIGHTS = {
+        "Quantum Computing Applications": 0.25,
+        "AI-Powered Affiliate Marketing": 0.20,
+        "Autonomous Revenue Systems": 0.15,
+        "Neural Network Optimization": 0.15,
+        "Quantum Machine Learning": 0.10,
+        "Automated Content Creation": 0.10,
+        "Digital Asset Management": 0.05
+    }
+    _TOPIC_KEYS = tuple(_TOPIC_WEIGHTS)
+    _TOPIC_CUM = tuple(itertools.accumulate(_TOPIC_WEIGHTS.values()))
+    
     def __init__(self):
         self.topics = [
             "Quantum Computing Applications",
@@ -22,7 +47,14 @@ class BlogGenerator:
             "Smart Contract Development",
             "Blockchain Analytics"
         ]
-        self.generated_posts = []
+        self.max_generated_posts = 10000
+        self.generated_posts = deque(maxlen=self.max_generated_posts)
+        
+        # Running totals so analytics stay O(1) as history grows
+        self._post_count = 0
+        self._total_words = 0
+        self._total_read_time = 0
+        self._topics = set()
         
     async def generate_blog_post(self, topic: Optional[str] = None, target_audience: str = "general") -> Dict:
         """Generate a complete blog post with AI"""
@@ -43,7 +75,7 @@ class BlogGenerator:
             
             # Create final blog post
             blog_post = {
-                "id": f"post_{len(self.generated_posts) + 1}",
+                "id": f"post_{self._post_count + 1}",
                 "title": post_structure["title"],
                 "slug": self._create_slug(post_structure["title"]),
                 "content": content,
@@ -54,12 +86,16 @@ class BlogGenerator:
                 "seo": seo_data,
                 "created_at": datetime.utcnow().isoformat(),
                 "status": "published",
-                "tags": post_structure["tags"],
+                "tags": list(post_structure["tags"]),
                 "estimated_read_time": self._calculate_read_time(content),
                 "word_count": len(content.split())
             }
             
             self.generated_posts.append(blog_post)
+            self._post_count += 1
+            self._total_words += blog_post["word_count"]
+            self._total_read_time += blog_post["estimated_read_time"]
+            self._topics.add(topic)
             
             logger.info(f"Blog post generated successfully: {blog_post['title']}")
             return blog_post
@@ -70,28 +106,17 @@ class BlogGenerator:
     
     def _select_trending_topic(self) -> str:
         """Select a trending topic based on current market conditions"""
-        import random
-        
-        # Weight topics based on current trends
-        weighted_topics = {
-            "Quantum Computing Applications": 0.25,
-            "AI-Powered Affiliate Marketing": 0.20,
-            "Autonomous Revenue Systems": 0.15,
-            "Neural Network Optimization": 0.15,
-            "Quantum Machine Learning": 0.10,
-            "Automated Content Creation": 0.10,
-            "Digital Asset Management": 0.05
-        }
-        
-        return random.choices(
-            list(weighted_topics.keys()),
-            weights=list(weighted_topics.values())
-        )[0]
+        r = random.random() * self._TOPIC_CUM[-1]
+        return self._TOPIC_KEYS[bisect.bisect(self._TOPIC_CUM, r)]
     
     async def _create_post_structure(self, topic: str, target_audience: str) -> Dict:
         """Create blog post structure"""
-        await asyncio.sleep(0.1)  # Simulate AI processing
-        
+        return self._post_structure_sync(topic)
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def _post_structure_sync(topic: str) -> Dict:
+        """Build (and memoize) the structure for a topic; callers must not mutate it"""
         structures = {
             "Quantum Computing Applications": {
                 "title": "Revolutionary Quantum Computing Applications Transforming Industries in 2024",
@@ -136,9 +161,12 @@ class BlogGenerator:
     
     async def _generate_content(self, structure: Dict) -> str:
         """Generate actual blog content"""
-        await asyncio.sleep(0.2)  # Simulate content generation
-        
-        content_parts = []
+        return await asyncio.to_thread(self._build_content, structure)
+    
+    def _build_content(self, structure: Dict) -> str:
+        """Assemble the blog body; CPU-bound, so run it off the event loop"""
+        # Stream parts into one buffer, newline-separated
+        content = io.StringIO()
         
         # Generate introduction
         intro = f"""
@@ -150,7 +178,7 @@ In today's rapidly evolving digital landscape, {structure['title'].lower()} repr
 
 The intersection of artificial intelligence, quantum computing, and autonomous systems is creating unprecedented opportunities for innovation and revenue generation. As we delve into this topic, we'll explore both the theoretical foundations and practical implementations that are driving real-world results.
 """
-        content_parts.append(intro)
+        content.write(intro)
         
         # Generate content for each section
         for section in structure.get('sections', []):
@@ -176,7 +204,8 @@ The implementation of these technologies in real-world scenarios demonstrates si
 4. **Scalability**: Cloud-based infrastructure supports exponential growth patterns
 
 """
-            content_parts.append(section_content)
+            content.write("\n")
+            content.write(section_content)
         
         # Generate conclusion
         conclusion = """
@@ -190,11 +219,14 @@ As we continue to push the boundaries of what's possible, the combination of hum
 
 *This article was generated by ArielMatrix AI, an autonomous content creation system that combines quantum computing research with advanced natural language processing.*
 """
-        content_parts.append(conclusion)
+        content.write("\n")
+        content.write(conclusion)
         
-        return "\n".join(content_parts)
+        return content.getvalue()
     
-    def _generate_section_content(self, section: str) -> str:
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def _generate_section_content(section: str) -> str:
         """Generate content for a specific section"""
         content_templates = {
             "Introduction": "This foundational section establishes the context and importance of our topic, providing readers with essential background knowledge.",
@@ -209,8 +241,10 @@ As we continue to push the boundaries of what's possible, the combination of hum
     
     async def _generate_seo_metadata(self, topic: str, content: str) -> Dict:
         """Generate SEO metadata for the blog post"""
-        await asyncio.sleep(0.1)
-        
+        return await asyncio.to_thread(self._build_seo_metadata, topic, content)
+    
+    def _build_seo_metadata(self, topic: str, content: str) -> Dict:
+        """Build SEO metadata; keyword extraction scans the whole post"""
         # Extract keywords from content
         keywords = self._extract_keywords(content)
         
@@ -227,21 +261,20 @@ As we continue to push the boundaries of what's possible, the combination of hum
     def _extract_keywords(self, content: str) -> List[str]:
         """Extract relevant keywords from content"""
         # Simple keyword extraction (in production, use more sophisticated NLP)
-        common_words = {'the', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'is', 'are', 'was', 'were', 'be', 'been', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'could', 'should', 'may', 'might', 'must', 'can', 'this', 'that', 'these', 'those'}
-        
-        words = re.findall(r'\b[a-zA-Z]{4,}\b', content.lower())
-        keywords = [word for word in words if word not in common_words]
+        # Filter and count in a single streaming pass over the matches
+        keyword_counts = Counter(
+            word for word in (match.group() for match in _WORD_RE.finditer(content.lower()))
+            if word not in STOPWORDS
+        )
         
         # Get most frequent keywords
-        from collections import Counter
-        keyword_counts = Counter(keywords)
         return [word for word, count in keyword_counts.most_common(10)]
     
     def _create_slug(self, title: str) -> str:
         """Create URL-friendly slug from title"""
         slug = title.lower()
-        slug = re.sub(r'[^a-z0-9\s-]', '', slug)
-        slug = re.sub(r'\s+', '-', slug)
+        slug = _SLUG_NON_ALNUM.sub('', slug)
+        slug = _SLUG_SPACES.sub('-', slug)
         return slug.strip('-')
     
     def _calculate_read_time(self, content: str) -> int:
@@ -252,34 +285,32 @@ As we continue to push the boundaries of what's possible, the combination of hum
     
     async def generate_multiple_posts(self, count: int = 5) -> List[Dict]:
         """Generate multiple blog posts"""
-        posts = []
-        for i in range(count):
-            topic = self._select_trending_topic()
-            post = await self.generate_blog_post(topic)
-            posts.append(post)
-            await asyncio.sleep(0.1)  # Small delay between generations
+        # Posts are independent, so generate them concurrently
+        posts = await asyncio.gather(
+            *(self.generate_blog_post(self._select_trending_topic()) for _ in range(count))
+        )
         
-        return posts
+        return list(posts)
     
     def get_generated_posts(self) -> List[Dict]:
-        """Get all generated blog posts"""
-        return self.generated_posts
+        """Get all retained blog posts (the most recent `max_generated_posts`)"""
+        return list(self.generated_posts)
     
     async def get_blog_analytics(self) -> Dict:
         """Get analytics for generated blog posts"""
-        if not self.generated_posts:
+        if not self._post_count:
             return {"total_posts": 0, "total_words": 0, "average_read_time": 0}
         
-        total_words = sum(post["word_count"] for post in self.generated_posts)
-        average_read_time = sum(post["estimated_read_time"] for post in self.generated_posts) / len(self.generated_posts)
-        
         return {
-            "total_posts": len(self.generated_posts),
-            "total_words": total_words,
-            "average_read_time": round(average_read_time, 1),
-            "topics_covered": list(set(post["topic"] for post in self.generated_posts)),
+            "total_posts": self._post_count,
+            "total_words": self._total_words,
+            "average_read_time": round(self._total_read_time / self._post_count, 1),
+            "topics_covered": list(self._topics),
             "latest_post": self.generated_posts[-1]["title"] if self.generated_posts else None
         }
 
+register_lru_cache("blog.post_structure", BlogGenerator._post_structure_sync)
+register_lru_cache("blog.section_content", BlogGenerator._generate_section_content)
+
 # Global blog generator instance
 blog_generator = BlogGenerator()
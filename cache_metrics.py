@@ -0,0 +1,39 @@
+from prometheus_client import Counter
+from prometheus_client.core import CounterMetricFamily, REGISTRY
+
+# Shared hit/miss counters for the in-process caches, labelled by cache name
+# so each TTL can be tuned from its observed hit rate
+CACHE_HITS = Counter("cache_hits_total", "In-process cache hits", ["name"])
+CACHE_MISSES = Counter("cache_misses_total", "In-process cache misses", ["name"])
+
+# functools.lru_cache keeps its own statistics; registered functions have
+# their cache_info() exported at scrape time
+_lru_caches = {}
+
+class _LruCacheCollector:
+    """Exports hits/misses of registered lru_cache functions"""
+    
+    def collect(self):
+        hits = CounterMetricFamily("lru_cache_hits", "functools.lru_cache hits", labels=["name"])
+        misses = CounterMetricFamily("lru_cache_misses", "functools.lru_cache misses", labels=["name"])
+        for name, cached in _lru_caches.items():
+            info = cached.cache_info()
+            hits.add_metric([name], info.hits)
+            misses.add_metric([name], info.misses)
+        yield hits
+        yield misses
+
+REGISTRY.register(_LruCacheCollector())
+
+def record_hit(name: str):
+    """Count a cache hit for `name`"""
+    CACHE_HITS.labels(name=name).inc()
+
+def record_miss(name: str):
+    """Count a cache miss for `name`"""
+    CACHE_MISSES.labels(name=name).inc()
+
+def register_lru_cache(name: str, cached):
+    """Export the cache_info() statistics of an lru_cache-wrapped function as `name`"""
+    _lru_caches[name] = cached
+    return cached
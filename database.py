@@ -6,13 +6,81 @@ Handles all database operations and connections
 import asyncio
 import logging
 import sqlite3
-import json
+import threading
+import orjson
+import msgspec
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, AsyncIterator
 import os
 
 logger = logging.getLogger("ArielDatabase")
 
+# dict/list values in JSON_COLUMNS are stored as MessagePack BLOBs; anywhere
+# else they are stored as JSON text, which is all the read path leaves alone
+_msgpack_encoder = msgspec.msgpack.Encoder()
+_msgpack_decoder = msgspec.msgpack.Decoder()
+
+def _encode(value, serialized: bool = False):
+    """Encode dict/list values as MessagePack for serialized columns, JSON text otherwise; other values pass through"""
+    if isinstance(value, (dict, list)):
+        if serialized:
+            return _msgpack_encoder.encode(value)
+        return orjson.dumps(value).decode()
+    return value
+
+def _decode(value):
+    """Decode a serialized column: MessagePack BLOBs, or JSON text left by rows written before BLOB storage"""
+    if isinstance(value, bytes):
+        return _msgpack_decoder.decode(value)
+    return orjson.loads(value)
+
+# Applied to every connection: WAL lets readers run alongside the writer and
+# synchronous=NORMAL skips the per-commit fsync that WAL makes unnecessary.
+# page_size only takes effect on a fresh file, so it must precede journal_mode.
+CONNECTION_PRAGMAS = (
+    "PRAGMA page_size=8192",
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-131072",
+    "PRAGMA mmap_size=1073741824",
+)
+
+TABLES = (
+    'ariel_logs', 'cycle_history', 'dashboard_metrics',
+    'opportunities', 'revenue_records', 'assets',
+    'campaigns', 'test_reports', 'system_metrics', 'neural_data'
+)
+
+# Rows pulled from a cursor per worker-thread hop when streaming results
+FETCH_BATCH_SIZE = 512
+
+# Rows buffered by append() per table and column set before a batched write
+APPEND_BUFFER_SIZE = 256
+
+# Columns holding serialized dict/list values, per table
+JSON_COLUMNS = {
+    'ariel_logs': ('data',),
+    'opportunities': ('data',),
+    'assets': ('data',),
+    'campaigns': ('data',),
+    'test_reports': ('results',),
+    'neural_data': ('training_data', 'predictions'),
+}
+
+# Row counts for every table in a single statement
+TABLE_COUNTS_SQL = " UNION ALL ".join(
+    f"SELECT '{table}', COUNT(*) FROM {table}" for table in TABLES
+)
+
+TABLE_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS idx_ariel_logs_cycle ON ariel_logs(cycle_number)",
+    "CREATE INDEX IF NOT EXISTS idx_opportunities_status_type ON opportunities(status, type)",
+    "CREATE INDEX IF NOT EXISTS idx_revenue_source_ts ON revenue_records(source, timestamp)",
+    "CREATE INDEX IF NOT EXISTS idx_campaigns_status ON campaigns(status)",
+    "CREATE INDEX IF NOT EXISTS idx_system_metrics_name_ts ON system_metrics(metric_name, timestamp)",
+)
+
 class ArielDatabase:
     """
     Database manager for the Ariel system
@@ -21,19 +89,57 @@ class ArielDatabase:
     
     def __init__(self, db_path: str = "ariel_system.db"):
         self.db_path = db_path
-        self.connection = None
         self._init_database()
+        
+        # One long-lived connection; SQLite allows a single writer at a time,
+        # so writes are serialized here instead of contending for the file lock.
+        # Statements run in worker threads (asyncio.to_thread) so they never
+        # block the event loop, hence a threading lock
+        self.connection = self._open()
+        self.connection.row_factory = sqlite3.Row
+        self._write_lock = threading.Lock()
+        
+        # Reads go through a query-only connection per worker thread, so they
+        # never see another statement's uncommitted writes and WAL lets them
+        # run alongside the writer without taking the write lock
+        self._readers = threading.local()
+        self._reader_connections: List[sqlite3.Connection] = []
+        
+        # SQL text per statement shape; stable text also lets sqlite3 reuse
+        # its own prepared statements instead of re-parsing
+        self._stmt_cache: Dict[tuple, str] = {}
+        
+        # Encoded rows waiting to be written by append(), per (table, columns)
+        self._append_buffers: Dict[tuple, List] = {}
+    
+    def _open(self) -> sqlite3.Connection:
+        """Open a connection configured with CONNECTION_PRAGMAS"""
+        conn = sqlite3.connect(self.db_path, check_same_thread=False, cached_statements=256)
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        return conn
     
     def _init_database(self):
         """Initialize database with required tables"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._open()
             cursor = conn.cursor()
             
             # Create main tables
             self._create_tables(cursor)
             
             conn.commit()
+            
+            # Column names per table, so reads don't rebuild them from cursor.description
+            # and identifiers can be checked before they are interpolated into SQL
+            tables = [row[0] for row in conn.execute(
+                "SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%'"
+            )]
+            self._columns = {
+                table: [info[1] for info in conn.execute(f"PRAGMA table_info({table})")]
+                for table in tables
+            }
+            self._column_sets = {table: frozenset(columns) for table, columns in self._columns.items()}
             conn.close()
             
             logger.info(f"✅ Database initialized: {self.db_path}")
@@ -53,7 +159,7 @@ class ArielDatabase:
                 timestamp TEXT NOT NULL,
                 cycle_number INTEGER DEFAULT 0,
                 total_revenue REAL DEFAULT 0.0,
-                data TEXT DEFAULT '{}',
+                data BLOB DEFAULT X'80',
                 created_at DATETIME DEFAULT CURRENT_TIMESTAMP
             )
         ''')
@@ -95,7 +201,7 @@ class ArielDatabase:
                 confidence REAL DEFAULT 0.0,
                 potential_revenue REAL DEFAULT 0.0,
                 source TEXT,
-                data TEXT DEFAULT '{}',
+                data BLOB DEFAULT X'80',
                 status TEXT DEFAULT 'identified',
                 timestamp TEXT NOT NULL,
                 created_at DATETIME DEFAULT CURRENT_TIMESTAMP
@@ -127,7 +233,7 @@ class ArielDatabase:
                 acquisition_price REAL DEFAULT 0.0,
                 acquisition_date TEXT,
                 status TEXT DEFAULT 'active',
-                data TEXT DEFAULT '{}',
+                data BLOB DEFAULT X'80',
                 created_at DATETIME DEFAULT CURRENT_TIMESTAMP
             )
         ''')
@@ -145,7 +251,7 @@ class ArielDatabase:
                 roi REAL DEFAULT 0.0,
                 start_date TEXT,
                 end_date TEXT,
-                data TEXT DEFAULT '{}',
+                data BLOB DEFAULT X'80',
                 created_at DATETIME DEFAULT CURRENT_TIMESTAMP
             )
         ''')
@@ -155,7 +261,7 @@ class ArielDatabase:
             CREATE TABLE IF NOT EXISTS test_reports (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 test_type TEXT NOT NULL,
-                results TEXT NOT NULL,
+                results BLOB NOT NULL,
                 success_rate REAL DEFAULT 0.0,
                 timestamp TEXT NOT NULL,
                 created_at DATETIME DEFAULT CURRENT_TIMESTAMP
@@ -179,40 +285,110 @@ class ArielDatabase:
             CREATE TABLE IF NOT EXISTS neural_data (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 model_name TEXT NOT NULL,
-                training_data TEXT,
-                predictions TEXT,
+                training_data BLOB,
+                predictions BLOB,
                 accuracy REAL DEFAULT 0.0,
                 timestamp TEXT NOT NULL,
                 created_at DATETIME DEFAULT CURRENT_TIMESTAMP
             )
         ''')
+        
+        # Indexes on the columns find_*/count filter by. Every index also
+        # carries the rowid (id), so "WHERE col = ? ORDER BY id DESC" is
+        # answered by walking the index backwards instead of scanning the table
+        for index_sql in TABLE_INDEXES:
+            cursor.execute(index_sql)
+    
+    def _check_identifiers(self, table: str, columns) -> None:
+        """Reject table or column names that are not part of the schema"""
+        known = self._column_sets.get(table)
+        if known is None:
+            raise ValueError(f"Unknown table: {table}")
+        unknown = [column for column in columns if column not in known]
+        if unknown:
+            raise ValueError(f"Unknown columns for {table}: {', '.join(unknown)}")
+    
+    def _get_insert_sql(self, table: str, columns: tuple, suffix: str = "") -> str:
+        """Get the (memoized) INSERT statement for a table and column set"""
+        key = ("insert", table, columns, suffix)
+        sql = self._stmt_cache.get(key)
+        if sql is None:
+            self._check_identifiers(table, columns)
+            sql = f"INSERT INTO {table} ({','.join(columns)}) VALUES ({','.join('?' * len(columns))}){suffix}"
+            self._stmt_cache[key] = sql
+        return sql
+    
+    def _get_select_sql(self, table: str, condition_columns: tuple, select: str = "*", suffix: str = "") -> str:
+        """Get the (memoized) SELECT statement for a table and WHERE column set"""
+        key = ("select", table, condition_columns, select, suffix)
+        sql = self._stmt_cache.get(key)
+        if sql is None:
+            self._check_identifiers(table, condition_columns)
+            sql = f"SELECT {select} FROM {table}"
+            if condition_columns:
+                sql += " WHERE " + " AND ".join(f"{column} = ?" for column in condition_columns)
+            sql += suffix
+            self._stmt_cache[key] = sql
+        return sql
+    
+    def _row_to_dict(self, table: str, row: sqlite3.Row) -> Dict:
+        """Convert a row to a dictionary, decoding the table's serialized columns"""
+        result = dict(zip(self._columns.get(table) or row.keys(), row))
+        for column in JSON_COLUMNS.get(table, ()):
+            value = result.get(column)
+            if value:
+                # A corrupt field keeps its raw value rather than sinking the whole read
+                try:
+                    result[column] = _decode(value)
+                except (msgspec.DecodeError, orjson.JSONDecodeError) as e:
+                    logger.warning(f"Could not decode {table}.{column} for row {result.get('id')}: {e}")
+        return result
+    
+    def _write_sync(self, query: str, params) -> sqlite3.Cursor:
+        """Run one write statement in its own transaction (worker thread)"""
+        with self._write_lock, self.connection:
+            return self.connection.execute(query, params)
+    
+    def _insert_returning_sync(self, query: str, params) -> int:
+        """Run an INSERT ... RETURNING id and fetch the id before commit (worker thread)"""
+        with self._write_lock, self.connection:
+            return self.connection.execute(query, params).fetchone()[0]
+    
+    def _write_many_sync(self, query: str, rows: List) -> sqlite3.Cursor:
+        """Run a batched write statement in a single transaction (worker thread)"""
+        with self._write_lock, self.connection:
+            return self.connection.executemany(query, rows)
+    
+    def _reader(self) -> sqlite3.Connection:
+        """Return this worker thread's read connection, opening it on first use"""
+        conn = getattr(self._readers, "connection", None)
+        if conn is None:
+            conn = self._open()
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA query_only=ON")
+            self._readers.connection = conn
+            with self._write_lock:
+                self._reader_connections.append(conn)
+        return conn
+    
+    def _read_sync(self, query: str, params) -> sqlite3.Cursor:
+        """Start a read query on this worker thread's read connection"""
+        return self._reader().execute(query, params)
+    
+    def _fetch_sync(self, query: str, params) -> List[sqlite3.Row]:
+        """Run a read query and return its rows (worker thread)"""
+        return self._read_sync(query, params).fetchall()
     
     async def insert_one(self, table: str, data: Dict) -> int:
         """Insert a single record into table"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Prepare data
-            columns = list(data.keys())
-            values = list(data.values())
-            placeholders = ','.join(['?' for _ in values])
-            
-            # Convert complex objects to JSON strings
-            processed_values = []
-            for value in values:
-                if isinstance(value, (dict, list)):
-                    processed_values.append(json.dumps(value))
-                else:
-                    processed_values.append(value)
+            # Convert complex objects to MessagePack
+            json_columns = JSON_COLUMNS.get(table, ())
+            processed_values = [_encode(value, column in json_columns) for column, value in data.items()]
             
             # Execute insert
-            query = f"INSERT INTO {table} ({','.join(columns)}) VALUES ({placeholders})"
-            cursor.execute(query, processed_values)
-            
-            record_id = cursor.lastrowid
-            conn.commit()
-            conn.close()
+            query = self._get_insert_sql(table, tuple(data), " RETURNING id")
+            record_id = await asyncio.to_thread(self._insert_returning_sync, query, processed_values)
             
             return record_id
             
@@ -220,99 +396,123 @@ class ArielDatabase:
             logger.error(f"Insert failed for table {table}: {e}")
             raise
     
+    async def insert_many(self, table: str, rows: List[Dict]) -> int:
+        """Insert records sharing the same columns in a single transaction"""
+        if not rows:
+            return 0
+        
+        try:
+            # Prepare data
+            columns = tuple(rows[0])
+            
+            # Convert complex objects to MessagePack
+            json_columns = JSON_COLUMNS.get(table, ())
+            serialized = [column in json_columns for column in columns]
+            processed_rows = [
+                [_encode(row[column], flag) for column, flag in zip(columns, serialized)]
+                for row in rows
+            ]
+            
+            # Execute batched insert
+            query = self._get_insert_sql(table, columns)
+            await asyncio.to_thread(self._write_many_sync, query, processed_rows)
+            
+            return len(processed_rows)
+            
+        except Exception as e:
+            logger.error(f"Insert many failed for table {table}: {e}")
+            raise
+    
+    async def append(self, table: str, data: Dict) -> None:
+        """Buffer a record for an append-only table such as ariel_logs or system_metrics"""
+        key = (table, tuple(data))
+        rows = self._append_buffers.get(key)
+        if rows is None:
+            # Reject bad table/column names here rather than at flush time
+            self._get_insert_sql(table, key[1])
+            rows = self._append_buffers[key] = []
+        json_columns = JSON_COLUMNS.get(table, ())
+        rows.append([_encode(value, column in json_columns) for column, value in data.items()])
+        
+        if len(rows) >= APPEND_BUFFER_SIZE:
+            await self.flush_appends(table)
+    
+    async def flush_appends(self, table: str = None) -> int:
+        """Write buffered records, one transaction per table and column set"""
+        written = 0
+        for key in [key for key in self._append_buffers if table is None or key[0] == table]:
+            rows = self._append_buffers.pop(key, None)
+            if not rows:
+                continue
+            try:
+                await asyncio.to_thread(self._write_many_sync, self._get_insert_sql(*key), rows)
+            except Exception as e:
+                # Put the batch back ahead of anything appended meanwhile
+                pending = self._append_buffers.setdefault(key, [])
+                pending[:0] = rows
+                logger.error(f"Flushing {len(rows)} buffered rows failed: {e}")
+                raise
+            written += len(rows)
+        return written
+    
     async def find_one(self, table: str, conditions: Dict = None) -> Optional[Dict]:
         """Find a single record from table"""
+        # Flush errors propagate instead of reading as "not found"
+        if self._append_buffers:
+            await self.flush_appends(table)
+        
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
             # Build query
-            query = f"SELECT * FROM {table}"
-            params = []
+            conditions = conditions or {}
+            query = self._get_select_sql(table, tuple(conditions), suffix=" ORDER BY id DESC LIMIT 1")
+            params = list(conditions.values())
             
-            if conditions:
-                where_clauses = []
-                for key, value in conditions.items():
-                    where_clauses.append(f"{key} = ?")
-                    params.append(value)
-                query += f" WHERE {' AND '.join(where_clauses)}"
+            rows = await asyncio.to_thread(self._fetch_sync, query, params)
             
-            query += " ORDER BY id DESC LIMIT 1"
-            
-            cursor.execute(query, params)
-            row = cursor.fetchone()
-            
-            if row:
-                # Get column names
-                columns = [description[0] for description in cursor.description]
-                
-                # Create dictionary
-                result = dict(zip(columns, row))
-                
-                # Parse JSON fields
-                for key, value in result.items():
-                    if isinstance(value, str) and (value.startswith('{') or value.startswith('[')):
-                        try:
-                            result[key] = json.loads(value)
-                        except:
-                            pass  # Keep as string if not valid JSON
-                
-                conn.close()
-                return result
+            if rows:
+                # Create dictionary, decoding serialized fields
+                return self._row_to_dict(table, rows[0])
             
-            conn.close()
             return None
             
         except Exception as e:
             logger.error(f"Find one failed for table {table}: {e}")
             return None
     
+    async def _iter_rows(self, query: str, params) -> AsyncIterator[sqlite3.Row]:
+        """Stream rows from a query in FETCH_BATCH_SIZE batches"""
+        cursor = await asyncio.to_thread(self._read_sync, query, params)
+        try:
+            while True:
+                rows = await asyncio.to_thread(cursor.fetchmany, FETCH_BATCH_SIZE)
+                if not rows:
+                    break
+                for row in rows:
+                    yield row
+        finally:
+            cursor.close()
+    
+    async def iter_many(self, table: str, conditions: Dict = None, limit: int = -1) -> AsyncIterator[Dict]:
+        """Stream records from table, newest first (a negative limit means no limit)"""
+        if self._append_buffers:
+            await self.flush_appends(table)
+        
+        # Build query
+        conditions = conditions or {}
+        query = self._get_select_sql(table, tuple(conditions), suffix=" ORDER BY id DESC LIMIT ?")
+        params = [*conditions.values(), limit]
+        
+        async for row in self._iter_rows(query, params):
+            # Decode serialized fields
+            yield self._row_to_dict(table, row)
+    
     async def find_many(self, table: str, conditions: Dict = None, limit: int = 100) -> List[Dict]:
         """Find multiple records from table"""
+        if self._append_buffers:
+            await self.flush_appends(table)
+        
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            # Build query
-            query = f"SELECT * FROM {table}"
-            params = []
-            
-            if conditions:
-                where_clauses = []
-                for key, value in conditions.items():
-                    where_clauses.append(f"{key} = ?")
-                    params.append(value)
-                query += f" WHERE {' AND '.join(where_clauses)}"
-            
-            query += f" ORDER BY id DESC LIMIT {limit}"
-            
-            cursor.execute(query, params)
-            rows = cursor.fetchall()
-            
-            if rows:
-                # Get column names
-                columns = [description[0] for description in cursor.description]
-                
-                # Create list of dictionaries
-                results = []
-                for row in rows:
-                    result = dict(zip(columns, row))
-                    
-                    # Parse JSON fields
-                    for key, value in result.items():
-                        if isinstance(value, str) and (value.startswith('{') or value.startswith('[')):
-                            try:
-                                result[key] = json.loads(value)
-                            except:
-                                pass  # Keep as string if not valid JSON
-                    
-                    results.append(result)
-                
-                conn.close()
-                return results
-            
-            conn.close()
-            return []
+            return [record async for record in self.iter_many(table, conditions, limit)]
             
         except Exception as e:
             logger.error(f"Find many failed for table {table}: {e}")
@@ -325,19 +525,16 @@ class ArielDatabase:
     async def update_one(self, table: str, conditions: Dict, updates: Dict) -> bool:
         """Update a single record in table"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+            self._check_identifiers(table, [*updates, *conditions])
             
             # Build update query
             set_clauses = []
             params = []
             
+            json_columns = JSON_COLUMNS.get(table, ())
             for key, value in updates.items():
                 set_clauses.append(f"{key} = ?")
-                if isinstance(value, (dict, list)):
-                    params.append(json.dumps(value))
-                else:
-                    params.append(value)
+                params.append(_encode(value, key in json_columns))
             
             # Build where clause
             where_clauses = []
@@ -347,11 +544,9 @@ class ArielDatabase:
             
             query = f"UPDATE {table} SET {','.join(set_clauses)} WHERE {' AND '.join(where_clauses)}"
             
-            cursor.execute(query, params)
-            rows_affected = cursor.rowcount
+            cursor = await asyncio.to_thread(self._write_sync, query, params)
             
-            conn.commit()
-            conn.close()
+            rows_affected = cursor.rowcount
             
             return rows_affected > 0
             
@@ -362,25 +557,16 @@ class ArielDatabase:
     async def delete_one(self, table: str, conditions: Dict) -> bool:
         """Delete a single record from table"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+            # Build delete query; DELETE ... LIMIT needs a non-default SQLite
+            # build, so target the oldest matching id through a subquery
+            subquery = self._get_select_sql(table, tuple(conditions), select="id", suffix=" ORDER BY id LIMIT 1")
+            query = f"DELETE FROM {table} WHERE id = ({subquery})"
+            params = list(conditions.values())
             
-            # Build delete query
-            where_clauses = []
-            params = []
+            cursor = await asyncio.to_thread(self._write_sync, query, params)
             
-            for key, value in conditions.items():
-                where_clauses.append(f"{key} = ?")
-                params.append(value)
-            
-            query = f"DELETE FROM {table} WHERE {' AND '.join(where_clauses)} LIMIT 1"
-            
-            cursor.execute(query, params)
             rows_affected = cursor.rowcount
             
-            conn.commit()
-            conn.close()
-            
             return rows_affected > 0
             
         except Exception as e:
@@ -390,8 +576,7 @@ class ArielDatabase:
     async def delete_many(self, table: str, conditions: Dict = None) -> int:
         """Delete multiple records from table"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
+            self._check_identifiers(table, conditions or ())
             
             # Build delete query
             query = f"DELETE FROM {table}"
@@ -404,11 +589,9 @@ class ArielDatabase:
                     params.append(value)
                 query += f" WHERE {' AND '.join(where_clauses)}"
             
-            cursor.execute(query, params)
-            rows_affected = cursor.rowcount
+            cursor = await asyncio.to_thread(self._write_sync, query, params)
             
-            conn.commit()
-            conn.close()
+            rows_affected = cursor.rowcount
             
             return rows_affected
             
@@ -418,78 +601,60 @@ class ArielDatabase:
     
     async def count(self, table: str, conditions: Dict = None) -> int:
         """Count records in table"""
+        if self._append_buffers:
+            await self.flush_appends(table)
+        
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
             # Build count query
-            query = f"SELECT COUNT(*) FROM {table}"
-            params = []
-            
-            if conditions:
-                where_clauses = []
-                for key, value in conditions.items():
-                    where_clauses.append(f"{key} = ?")
-                    params.append(value)
-                query += f" WHERE {' AND '.join(where_clauses)}"
+            conditions = conditions or {}
+            query = self._get_select_sql(table, tuple(conditions), select="COUNT(*)")
+            params = list(conditions.values())
             
-            cursor.execute(query, params)
-            count = cursor.fetchone()[0]
+            rows = await asyncio.to_thread(self._fetch_sync, query, params)
             
-            conn.close()
-            return count
+            return rows[0][0]
             
         except Exception as e:
             logger.error(f"Count failed for table {table}: {e}")
             return 0
     
+    async def iter_query(self, query: str, params: List = None) -> AsyncIterator[Dict]:
+        """Stream the rows of a custom SQL query as dictionaries; JSON_COLUMNS come back as raw MessagePack BLOBs"""
+        async for row in self._iter_rows(query, params or []):
+            yield dict(row)
+    
     async def execute_query(self, query: str, params: List = None) -> List[Dict]:
         """Execute custom SQL query"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            if params:
-                cursor.execute(query, params)
-            else:
-                cursor.execute(query)
-            
-            rows = cursor.fetchall()
-            
-            if rows:
-                # Get column names
-                columns = [description[0] for description in cursor.description]
-                
-                # Create list of dictionaries
-                results = []
-                for row in rows:
-                    result = dict(zip(columns, row))
-                    results.append(result)
-                
-                conn.close()
-                return results
-            
-            conn.close()
-            return []
+            return [record async for record in self.iter_query(query, params)]
             
         except Exception as e:
             logger.error(f"Custom query failed: {e}")
             return []
     
+    def close(self):
+        """Write any buffered records and close the shared and read connections"""
+        if self.connection:
+            for key, rows in self._append_buffers.items():
+                self._write_many_sync(self._get_insert_sql(*key), rows)
+            self._append_buffers.clear()
+            self.connection.close()
+            self.connection = None
+            for conn in self._reader_connections:
+                conn.close()
+            self._reader_connections.clear()
+    
     async def get_database_stats(self) -> Dict:
         """Get database statistics"""
+        if self._append_buffers:
+            await self.flush_appends()
+        
         try:
             stats = {}
             
             # Get table counts
-            tables = [
-                'ariel_logs', 'cycle_history', 'dashboard_metrics',
-                'opportunities', 'revenue_records', 'assets',
-                'campaigns', 'test_reports', 'system_metrics', 'neural_data'
-            ]
-            
-            for table in tables:
-                count = await self.count(table)
+            rows = await asyncio.to_thread(self._fetch_sync, TABLE_COUNTS_SQL, ())
+            for table, count in rows:
                 stats[f"{table}_count"] = count
             
             # Get database file size
@@ -523,3 +688,12 @@ async def init_database():
     db = await get_db()
     logger.info("✅ Database initialized and ready")
     return db
+
+async def close_database():
+    """Write buffered records and close the shared database"""
+    global _db_instance
+    
+    if _db_instance is not None:
+        await _db_instance.flush_appends()
+        _db_instance.close()
+        _db_instance = None
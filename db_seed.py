@@ -1,13 +1,21 @@
 import asyncio
 import logging
 from datetime import datetime, timedelta
-import random
 from typing import Dict, List
+import numpy as np
 from auth import auth_manager
 from blog_generator import blog_generator
+from database import get_db
 
 logger = logging.getLogger("ArielMatrix.DatabaseSeeder")
 
+# One generator for every seeder; fields are drawn per batch rather than per record
+_rng = np.random.default_rng(42)
+
+def _choices(pool: List, count: int) -> List:
+    """Draw count items from pool with replacement"""
+    return [pool[i] for i in _rng.integers(0, len(pool), count)]
+
 class DatabaseSeeder:
     def __init__(self):
         self.seeded_data = {
@@ -23,20 +31,16 @@ class DatabaseSeeder:
         logger.info("Starting database seeding...")
         
         try:
-            # Seed users
+            # Seed users first; later records reference them
             await self.seed_users()
             
-            # Seed quantum research data
-            await self.seed_quantum_research()
-            
-            # Seed revenue records
-            await self.seed_revenue_records()
-            
-            # Seed blog posts
-            await self.seed_blog_posts()
-            
-            # Seed affiliate campaigns
-            await self.seed_affiliate_campaigns()
+            # The remaining seeders are independent and each fills its own list
+            await asyncio.gather(
+                self.seed_quantum_research(),
+                self.seed_revenue_records(),
+                self.seed_blog_posts(),
+                self.seed_affiliate_campaigns()
+            )
             
             logger.info("Database seeding completed successfully")
             return self.seeded_data
@@ -109,20 +113,36 @@ class DatabaseSeeder:
         quantum_algorithms = ["grover", "shor", "vqe", "qaoa", "quantum_annealing"]
         research_areas = ["optimization", "cryptography", "machine_learning", "simulation"]
         
-        for i in range(20):
+        count = 20
+        levels = ["low", "medium", "high"]
+        
+        # Draw every field for the batch up front
+        algorithms = _choices(quantum_algorithms, count)
+        areas = _choices(research_areas, count)
+        complexities = _choices(levels, count)
+        risk_levels = _choices(levels, count)
+        statuses = _choices(["active", "completed", "on_hold"], count)
+        speedups = _rng.uniform(2.0, 1000.0, count).tolist()
+        confidences = _rng.uniform(0.6, 0.95, count).tolist()
+        viabilities = _rng.uniform(0.3, 0.9, count).tolist()
+        revenues = _rng.uniform(5000, 200000, count).tolist()
+        times_to_market = _rng.integers(6, 49, count).tolist()
+        ages = _rng.integers(1, 31, count).tolist()
+        base_now = datetime.utcnow()
+        
+        for i in range(count):
             research_record = {
-                "id": f"quantum_research_{i+1}",
-                "algorithm": random.choice(quantum_algorithms),
-                "research_area": random.choice(research_areas),
-                "potential_speedup": random.uniform(2.0, 1000.0),
-                "confidence": random.uniform(0.6, 0.95),
-                "implementation_complexity": random.choice(["low", "medium", "high"]),
-                "commercial_viability": random.uniform(0.3, 0.9),
-                "potential_revenue": random.uniform(5000, 200000),
-                "time_to_market": random.randint(6, 48),
-                "risk_level": random.choice(["low", "medium", "high"]),
-                "created_at": (datetime.utcnow() - timedelta(days=random.randint(1, 30))).isoformat(),
-                "status": random.choice(["active", "completed", "on_hold"]),
+                "algorithm": algorithms[i],
+                "research_area": areas[i],
+                "potential_speedup": speedups[i],
+                "confidence": confidences[i],
+                "implementation_complexity": complexities[i],
+                "commercial_viability": viabilities[i],
+                "potential_revenue": revenues[i],
+                "time_to_market": times_to_market[i],
+                "risk_level": risk_levels[i],
+                "created_at": (base_now - timedelta(days=ages[i])).isoformat(),
+                "status": statuses[i],
                 "autonomous_generated": True
             }
             
@@ -143,23 +163,50 @@ class DatabaseSeeder:
             "premium_features"
         ]
         
-        for i in range(50):
+        count = 50
+        
+        # Draw every field for the batch up front
+        sources = _choices(revenue_sources, count)
+        statuses = _choices(["completed", "pending", "failed"], count)
+        quantum_flags = _choices([True, False], count)
+        amounts = _rng.uniform(10.0, 5000.0, count).round(2).tolist()
+        commission_rates = _rng.uniform(0.05, 0.30, count).tolist()
+        ages = _rng.integers(1, 91, count).tolist()
+        campaign_numbers = _rng.integers(1, 11, count).tolist()
+        user_numbers = _rng.integers(1, 5, count).tolist()
+        base_now = datetime.utcnow()
+        transaction_ids = [f"revenue_{i}" for i in range(1, count + 1)]
+        
+        for i in range(count):
             revenue_record = {
-                "id": f"revenue_{i+1}",
-                "source": random.choice(revenue_sources),
-                "amount": round(random.uniform(10.0, 5000.0), 2),
+                "transaction_id": transaction_ids[i],
+                "source": sources[i],
+                "amount": amounts[i],
                 "currency": "USD",
-                "transaction_date": (datetime.utcnow() - timedelta(days=random.randint(1, 90))).isoformat(),
-                "status": random.choice(["completed", "pending", "failed"]),
-                "commission_rate": random.uniform(0.05, 0.30),
-                "campaign_id": f"campaign_{random.randint(1, 10)}",
-                "user_id": f"user_{random.randint(1, 4)}",
+                "transaction_date": (base_now - timedelta(days=ages[i])).isoformat(),
+                "status": statuses[i],
+                "commission_rate": commission_rates[i],
+                "campaign_id": f"campaign_{campaign_numbers[i]}",
+                "user_id": f"user_{user_numbers[i]}",
                 "autonomous_generated": True,
-                "quantum_optimized": random.choice([True, False])
+                "quantum_optimized": quantum_flags[i]
             }
             
             self.seeded_data["revenue_records"].append(revenue_record)
         
+        # Persist the whole batch in one transaction
+        db = await get_db()
+        await db.insert_many("revenue_records", [
+            {
+                "source": record["source"],
+                "amount": record["amount"],
+                "currency": record["currency"],
+                "transaction_id": record["transaction_id"],
+                "timestamp": record["transaction_date"]
+            }
+            for record in self.seeded_data["revenue_records"]
+        ])
+        
         logger.info(f"Created {len(self.seeded_data['revenue_records'])} revenue records")
     
     async def seed_blog_posts(self):
@@ -199,28 +246,61 @@ class DatabaseSeeder:
         campaign_types = ["tech_products", "health_wellness", "finance", "education", "software"]
         campaign_statuses = ["active", "paused", "completed", "draft"]
         
-        for i in range(15):
+        count = 15
+        
+        # Draw every field for the batch up front
+        name_types = _choices(campaign_types, count)
+        types = _choices(campaign_types, count)
+        statuses = _choices(campaign_statuses, count)
+        quantum_flags = _choices([True, False], count)
+        budgets = _rng.uniform(100.0, 10000.0, count).round(2).tolist()
+        spent = _rng.uniform(50.0, 8000.0, count).round(2).tolist()
+        revenues = _rng.uniform(200.0, 15000.0, count).round(2).tolist()
+        commission_rates = _rng.uniform(0.05, 0.25, count).tolist()
+        click_counts = _rng.integers(100, 10001, count).tolist()
+        conversion_counts = _rng.integers(10, 501, count).tolist()
+        conversion_rates = _rng.uniform(0.01, 0.08, count).tolist()
+        created_ages = _rng.integers(1, 61, count).tolist()
+        updated_ages = _rng.integers(0, 31, count).tolist()
+        base_now = datetime.utcnow()
+        
+        for i in range(count):
             campaign_record = {
-                "id": f"campaign_{i+1}",
-                "name": f"{random.choice(campaign_types).replace('_', ' ').title()} Campaign {i+1}",
-                "type": random.choice(campaign_types),
-                "status": random.choice(campaign_statuses),
-                "budget": round(random.uniform(100.0, 10000.0), 2),
-                "spent": round(random.uniform(50.0, 8000.0), 2),
-                "revenue": round(random.uniform(200.0, 15000.0), 2),
-                "commission_rate": random.uniform(0.05, 0.25),
-                "click_count": random.randint(100, 10000),
-                "conversion_count": random.randint(10, 500),
-                "conversion_rate": random.uniform(0.01, 0.08),
-                "created_at": (datetime.utcnow() - timedelta(days=random.randint(1, 60))).isoformat(),
-                "updated_at": (datetime.utcnow() - timedelta(days=random.randint(0, 30))).isoformat(),
+                "name": f"{name_types[i].replace('_', ' ').title()} Campaign {i+1}",
+                "type": types[i],
+                "status": statuses[i],
+                "budget": budgets[i],
+                "spent": spent[i],
+                "revenue": revenues[i],
+                "commission_rate": commission_rates[i],
+                "click_count": click_counts[i],
+                "conversion_count": conversion_counts[i],
+                "conversion_rate": conversion_rates[i],
+                "created_at": (base_now - timedelta(days=created_ages[i])).isoformat(),
+                "updated_at": (base_now - timedelta(days=updated_ages[i])).isoformat(),
                 "autonomous_managed": True,
                 "ai_optimized": True,
-                "quantum_enhanced": random.choice([True, False])
+                "quantum_enhanced": quantum_flags[i]
             }
             
             self.seeded_data["affiliate_campaigns"].append(campaign_record)
         
+        # Persist the whole batch in one transaction
+        db = await get_db()
+        await db.insert_many("campaigns", [
+            {
+                "campaign_type": record["type"],
+                "name": record["name"],
+                "status": record["status"],
+                "budget": record["budget"],
+                "spent": record["spent"],
+                "revenue": record["revenue"],
+                "start_date": record["created_at"],
+                "data": record
+            }
+            for record in self.seeded_data["affiliate_campaigns"]
+        ])
+        
         logger.info(f"Created {len(self.seeded_data['affiliate_campaigns'])} affiliate campaigns")
     
     async def get_seeding_summary(self) -> Dict:
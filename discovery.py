@@ -1,15 +1,94 @@
 import asyncio
+import heapq
 import logging
 import random
+from collections import Counter
+from dataclasses import dataclass, field, replace
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional
-import aiohttp
+import numpy as np
+from cachetools import TTLCache
+from cache_metrics import record_hit, record_miss
 
 logger = logging.getLogger("ArielMatrix.Discovery")
 
+# Maximum outbound discovery fetches in flight at once
+DISCOVERY_CONCURRENCY = 20
+
+# Seconds a sector's market analysis is reused across discovery passes
+SECTOR_CACHE_TTL = 300
+
+# Opportunity tiers, indexed by the lower of the value-score and revenue bands
+_TIERS = ('basic', 'medium', 'high', 'premium')
+
+# Pools the simulated opportunities draw their text from
+_DESCRIPTIONS = (
+    "High-converting affiliate program with competitive commission rates",
+    "Emerging market opportunity with low competition",
+    "Partnership opportunity with established brand",
+    "Revenue sharing program for content creators",
+    "Referral program with recurring commissions",
+    "Contest with significant prize pool and exposure",
+    "Grant opportunity for innovative projects",
+    "Collaboration opportunity with industry leaders"
+)
+
+_REQUIREMENTS = (
+    "API integration capability",
+    "Minimum traffic threshold",
+    "Content creation skills",
+    "Social media presence",
+    "Technical expertise",
+    "Marketing experience",
+    "Compliance certification",
+    "Geographic restrictions"
+)
+
+_HASHTAGS = (
+    "#affiliate", "#marketing", "#opportunity", "#business",
+    "#entrepreneur", "#passive income", "#revenue", "#growth",
+    "#partnership", "#collaboration", "#innovation", "#tech"
+)
+
+@dataclass(slots=True)
+class Opportunity:
+    """A discovered opportunity; channel-specific fields are kept in details"""
+    type: str
+    source: str
+    title: str
+    description: str
+    value_score: int
+    estimated_revenue: float
+    category: str
+    discovered_at: str
+    details: Dict[str, Any] = field(default_factory=dict)
+    rank: Optional[int] = None
+    tier: Optional[str] = None
+    # (sector, analysis timestamp, title) for market analysis results, shared
+    # by every copy served from the sector cache
+    cache_key: Optional[tuple] = None
+    
+    def to_dict(self) -> Dict:
+        """Flatten into the dictionary shape returned by find_opportunities"""
+        result = {
+            "type": self.type,
+            "source": self.source,
+            "title": self.title,
+            "description": self.description,
+            "value_score": self.value_score,
+            "estimated_revenue": self.estimated_revenue,
+            "category": self.category,
+            "discovered_at": self.discovered_at,
+            **self.details
+        }
+        if self.rank is not None:
+            result["rank"] = self.rank
+            result["tier"] = self.tier
+        return result
+
 class Discovery:
     def __init__(self):
-        self.opportunities = []
+        self.opportunities: List[Opportunity] = []
         self.discovery_sources = [
             'web_scraping',
             'api_monitoring',
@@ -23,43 +102,66 @@ class Discovery:
             "revenue share", "commission", "cashback", "referral"
         ]
         
+        # Caps the discovery fetches in flight across all channels
+        self._fetch_slots = asyncio.Semaphore(DISCOVERY_CONCURRENCY)
+        
+        # Dedicated generators for the simulated results; numpy fills numeric batches
+        self._rng = random.Random()
+        self._np_rng = np.random.default_rng()
+        
+        # Market analysis results per sector, and a lock per sector so
+        # concurrent passes share a single analysis
+        self._sector_cache = TTLCache(maxsize=64, ttl=SECTOR_CACHE_TTL)
+        self._sector_locks: Dict[str, asyncio.Lock] = {}
+        # cache_keys of sector results already stored in self.opportunities
+        self._recorded_keys: set = set()
+    
     async def find_opportunities(self):
         """Discover opportunities through multiple channels"""
         logger.info("Discovering opportunities through multiple channels...")
         
         try:
-            opportunities_found = []
-            
-            # Web-based discovery
-            web_opportunities = await self._discover_web_opportunities()
-            opportunities_found.extend(web_opportunities)
-            
-            # API-based discovery
-            api_opportunities = await self._discover_api_opportunities()
-            opportunities_found.extend(api_opportunities)
+            # One timestamp for every opportunity found in this pass
+            discovered_at = datetime.utcnow().isoformat()
             
-            # Market analysis discovery
-            market_opportunities = await self._discover_market_opportunities()
-            opportunities_found.extend(market_opportunities)
+            # Web, API, market analysis and social media discovery run concurrently;
+            # a failing channel is logged and skipped
+            channel_results = await asyncio.gather(
+                self._discover_web_opportunities(discovered_at),
+                self._discover_api_opportunities(discovered_at),
+                self._discover_market_opportunities(discovered_at),
+                self._discover_social_opportunities(discovered_at),
+                return_exceptions=True
+            )
             
-            # Social media discovery
-            social_opportunities = await self._discover_social_opportunities()
-            opportunities_found.extend(social_opportunities)
+            opportunities_found = []
+            for result in channel_results:
+                if isinstance(result, Exception):
+                    logger.error(f"Discovery channel failed: {result}")
+                    continue
+                opportunities_found.extend(result)
             
             # Filter and rank opportunities
             filtered_opportunities = await self._filter_and_rank_opportunities(opportunities_found)
             
             discovery_result = {
                 "timestamp": datetime.utcnow().isoformat(),
-                "opportunities_found": filtered_opportunities,
+                "opportunities_found": [opportunity.to_dict() for opportunity in filtered_opportunities],
                 "total_discovered": len(opportunities_found),
                 "total_filtered": len(filtered_opportunities),
                 "discovery_sources_used": len(self.discovery_sources),
                 "discovery_summary": await self.get_discovery_summary()
             }
             
-            # Store opportunities
-            self.opportunities.extend(filtered_opportunities)
+            # Store opportunities; a cached sector result is stored only the
+            # first time it makes it through the filter
+            for opportunity in filtered_opportunities:
+                key = opportunity.cache_key
+                if key is not None:
+                    if key in self._recorded_keys:
+                        continue
+                    self._recorded_keys.add(key)
+                self.opportunities.append(opportunity)
             
             logger.info(f"Discovery completed. Found {len(filtered_opportunities)} high-quality opportunities")
             return discovery_result
@@ -68,10 +170,8 @@ class Discovery:
             logger.error(f"Opportunity discovery failed: {e}")
             raise
     
-    async def _discover_web_opportunities(self):
+    async def _discover_web_opportunities(self, discovered_at: str):
         """Discover opportunities through web scraping"""
-        opportunities = []
-        
         # Simulate web scraping results
         web_sources = [
             "https://example-affiliate-network.com/offers",
@@ -80,34 +180,53 @@ class Discovery:
             "https://test-grants.org/open-calls"
         ]
         
-        for source in web_sources:
+        results = await asyncio.gather(*(self._scrape_web_source(source, discovered_at) for source in web_sources))
+        return [opportunity for found in results for opportunity in found]
+    
+    async def _scrape_web_source(self, source: str, discovered_at: str):
+        """Scrape a single web source for opportunities"""
+        opportunities = []
+        
+        async with self._fetch_slots:
             await asyncio.sleep(0.1)  # Simulate scraping time
+        
+        # Simulate finding opportunities
+        rng = self._rng
+        if rng.random() > 0.3:  # 70% chance to find opportunities
+            n = rng.randint(1, 5)
+            
+            # Draw every field for the whole batch at once
+            np_rng = self._np_rng
+            title_ids = np_rng.integers(1000, 10000, n).tolist()
+            value_scores = np_rng.integers(60, 96, n).tolist()
+            revenues = np_rng.uniform(100, 2000, n).tolist()
+            commission_rates = np_rng.uniform(5.0, 25.0, n).tolist()
+            descriptions = rng.choices(_DESCRIPTIONS, k=n)
+            categories = rng.choices(['affiliate', 'contest', 'partnership', 'grant'], k=n)
+            difficulties = rng.choices(['easy', 'medium', 'hard'], k=n)
             
-            # Simulate finding opportunities
-            if random.random() > 0.3:  # 70% chance to find opportunities
-                num_opportunities = random.randint(1, 5)
-                
-                for i in range(num_opportunities):
-                    opportunity = {
-                        "type": "web_discovery",
-                        "source": source,
-                        "title": f"Web Opportunity {random.randint(1000, 9999)}",
-                        "description": self._generate_opportunity_description(),
-                        "value_score": random.randint(60, 95),
-                        "commission_rate": random.uniform(5.0, 25.0),
-                        "estimated_revenue": random.uniform(100, 2000),
-                        "difficulty": random.choice(['easy', 'medium', 'hard']),
-                        "category": random.choice(['affiliate', 'contest', 'partnership', 'grant']),
-                        "discovered_at": datetime.utcnow().isoformat()
+            opportunities = [
+                Opportunity(
+                    type="web_discovery",
+                    source=source,
+                    title=f"Web Opportunity {title_ids[i]}",
+                    description=descriptions[i],
+                    value_score=value_scores[i],
+                    estimated_revenue=revenues[i],
+                    category=categories[i],
+                    discovered_at=discovered_at,
+                    details={
+                        "commission_rate": commission_rates[i],
+                        "difficulty": difficulties[i]
                     }
-                    opportunities.append(opportunity)
+                )
+                for i in range(n)
+            ]
         
         return opportunities
     
-    async def _discover_api_opportunities(self):
+    async def _discover_api_opportunities(self, discovered_at: str):
         """Discover opportunities through API monitoring"""
-        opportunities = []
-        
         # Simulate API-based discovery
         api_sources = [
             "affiliate_networks_api",
@@ -116,153 +235,194 @@ class Discovery:
             "job_boards_api"
         ]
         
-        for api_source in api_sources:
+        # A failing source is logged and skipped rather than failing the channel
+        results = await asyncio.gather(
+            *(self._poll_api_source(api_source, discovered_at) for api_source in api_sources),
+            return_exceptions=True
+        )
+        
+        opportunities = []
+        for api_source, result in zip(api_sources, results):
+            if isinstance(result, Exception):
+                logger.warning(f"API source {api_source} failed: {result}")
+                continue
+            opportunities.extend(result)
+        return opportunities
+    
+    async def _poll_api_source(self, api_source: str, discovered_at: str):
+        """Poll a single API source for opportunities"""
+        opportunities = []
+        
+        async with self._fetch_slots:
             await asyncio.sleep(0.1)  # Simulate API call time
+        
+        rng = self._rng
+        if rng.random() > 0.4:  # 60% chance to find opportunities
+            num_opportunities = rng.randint(1, 3)
             
-            if random.random() > 0.4:  # 60% chance to find opportunities
-                num_opportunities = random.randint(1, 3)
-                
-                for i in range(num_opportunities):
-                    opportunity = {
-                        "type": "api_discovery",
-                        "source": api_source,
-                        "title": f"API Opportunity {random.randint(1000, 9999)}",
-                        "description": self._generate_opportunity_description(),
-                        "value_score": random.randint(65, 90),
-                        "api_endpoint": f"https://api.{api_source}.com/opportunities/{random.randint(100, 999)}",
-                        "estimated_revenue": random.uniform(200, 1500),
-                        "requirements": self._generate_requirements(),
-                        "category": "api_integration",
-                        "discovered_at": datetime.utcnow().isoformat()
+            # Draw the discrete fields for the whole batch at once
+            title_ids = rng.choices(range(1000, 10000), k=num_opportunities)
+            value_scores = rng.choices(range(65, 91), k=num_opportunities)
+            endpoint_ids = rng.choices(range(100, 1000), k=num_opportunities)
+            
+            for title_id, value_score, endpoint_id in zip(title_ids, value_scores, endpoint_ids):
+                opportunity = Opportunity(
+                    type="api_discovery",
+                    source=api_source,
+                    title=f"API Opportunity {title_id}",
+                    description=self._generate_opportunity_description(),
+                    value_score=value_score,
+                    estimated_revenue=rng.uniform(200, 1500),
+                    category="api_integration",
+                    discovered_at=discovered_at,
+                    details={
+                        "api_endpoint": f"https://api.{api_source}.com/opportunities/{endpoint_id}",
+                        "requirements": self._generate_requirements()
                     }
-                    opportunities.append(opportunity)
+                )
+                opportunities.append(opportunity)
         
         return opportunities
     
-    async def _discover_market_opportunities(self):
+    async def _discover_market_opportunities(self, discovered_at: str):
         """Discover opportunities through market analysis"""
-        opportunities = []
-        
         # Simulate market analysis
         market_sectors = ['fintech', 'healthtech', 'edtech', 'ecommerce', 'saas', 'crypto']
         
-        for sector in market_sectors:
+        results = await asyncio.gather(*(self._analyze_sector(sector, discovered_at) for sector in market_sectors))
+        return [opportunity for found in results for opportunity in found]
+    
+    async def _analyze_sector(self, sector: str, discovered_at: str):
+        """Return the cached analysis for a market sector, running it on a miss"""
+        opportunities = self._sector_cache.get(sector)
+        from_cache = opportunities is not None
+        if from_cache:
+            record_hit("discovery.sector")
+        else:
+            # Only one coroutine analyzes an expired sector; the rest wait for it
+            async with self._sector_locks.setdefault(sector, asyncio.Lock()):
+                opportunities = self._sector_cache.get(sector)
+                from_cache = opportunities is not None
+                if from_cache:
+                    record_hit("discovery.sector")
+                else:
+                    record_miss("discovery.sector")
+                    opportunities = await self._run_sector_analysis(sector, discovered_at)
+                    self._sector_cache[sector] = opportunities
+                    # Keys of the expired analysis can never be served again
+                    self._recorded_keys = {key for key in self._recorded_keys if key[0] != sector}
+        
+        # Ranking annotates opportunities in place, so hand out copies; cached
+        # ones are restamped with this pass's timestamp
+        if not from_cache:
+            return [replace(opportunity) for opportunity in opportunities]
+        return [replace(opportunity, discovered_at=discovered_at) for opportunity in opportunities]
+    
+    async def _run_sector_analysis(self, sector: str, discovered_at: str):
+        """Analyze a single market sector for opportunities"""
+        opportunities = []
+        
+        async with self._fetch_slots:
             await asyncio.sleep(0.1)  # Simulate analysis time
-            
-            if random.random() > 0.5:  # 50% chance to find opportunities in each sector
-                opportunity = {
-                    "type": "market_analysis",
-                    "source": f"{sector}_market_analysis",
-                    "title": f"{sector.title()} Market Opportunity",
-                    "description": f"Emerging opportunity in {sector} sector based on market trends",
-                    "value_score": random.randint(70, 95),
-                    "market_size": random.uniform(1000000, 50000000),  # Market size in USD
-                    "growth_rate": random.uniform(10, 50),  # Annual growth rate %
-                    "competition_level": random.choice(['low', 'medium', 'high']),
-                    "entry_barrier": random.choice(['low', 'medium', 'high']),
-                    "estimated_revenue": random.uniform(500, 5000),
-                    "category": "market_opportunity",
-                    "sector": sector,
-                    "discovered_at": datetime.utcnow().isoformat()
-                }
-                opportunities.append(opportunity)
+        
+        if self._rng.random() > 0.5:  # 50% chance to find opportunities in each sector
+            title = f"{sector.title()} Market Opportunity"
+            opportunity = Opportunity(
+                type="market_analysis",
+                source=f"{sector}_market_analysis",
+                title=title,
+                description=f"Emerging opportunity in {sector} sector based on market trends",
+                value_score=self._rng.randint(70, 95),
+                estimated_revenue=self._rng.uniform(500, 5000),
+                category="market_opportunity",
+                discovered_at=discovered_at,
+                details={
+                    "market_size": self._rng.uniform(1000000, 50000000),  # Market size in USD
+                    "growth_rate": self._rng.uniform(10, 50),  # Annual growth rate %
+                    "competition_level": self._rng.choice(['low', 'medium', 'high']),
+                    "entry_barrier": self._rng.choice(['low', 'medium', 'high']),
+                    "sector": sector
+                },
+                cache_key=(sector, discovered_at, title)
+            )
+            opportunities.append(opportunity)
         
         return opportunities
     
-    async def _discover_social_opportunities(self):
+    async def _discover_social_opportunities(self, discovered_at: str):
         """Discover opportunities through social media monitoring"""
-        opportunities = []
-        
         # Simulate social media monitoring
         social_platforms = ['twitter', 'linkedin', 'reddit', 'discord', 'telegram']
         
-        for platform in social_platforms:
+        results = await asyncio.gather(*(self._monitor_platform(platform, discovered_at) for platform in social_platforms))
+        return [opportunity for found in results for opportunity in found]
+    
+    async def _monitor_platform(self, platform: str, discovered_at: str):
+        """Monitor a single social platform for opportunities"""
+        opportunities = []
+        
+        async with self._fetch_slots:
             await asyncio.sleep(0.1)  # Simulate monitoring time
-            
-            if random.random() > 0.6:  # 40% chance to find opportunities on each platform
-                opportunity = {
-                    "type": "social_discovery",
-                    "source": f"{platform}_monitoring",
-                    "title": f"Social Opportunity from {platform.title()}",
-                    "description": f"Opportunity discovered through {platform} social listening",
-                    "value_score": random.randint(55, 85),
+        
+        if self._rng.random() > 0.6:  # 40% chance to find opportunities on each platform
+            opportunity = Opportunity(
+                type="social_discovery",
+                source=f"{platform}_monitoring",
+                title=f"Social Opportunity from {platform.title()}",
+                description=f"Opportunity discovered through {platform} social listening",
+                value_score=self._rng.randint(55, 85),
+                estimated_revenue=self._rng.uniform(50, 1000),
+                category="social_opportunity",
+                discovered_at=discovered_at,
+                details={
                     "platform": platform,
-                    "engagement_potential": random.randint(100, 10000),
-                    "viral_potential": random.choice(['low', 'medium', 'high']),
-                    "estimated_revenue": random.uniform(50, 1000),
-                    "category": "social_opportunity",
-                    "hashtags": self._generate_hashtags(),
-                    "discovered_at": datetime.utcnow().isoformat()
+                    "engagement_potential": self._rng.randint(100, 10000),
+                    "viral_potential": self._rng.choice(['low', 'medium', 'high']),
+                    "hashtags": self._generate_hashtags()
                 }
-                opportunities.append(opportunity)
+            )
+            opportunities.append(opportunity)
         
         return opportunities
     
     def _generate_opportunity_description(self):
         """Generate a realistic opportunity description"""
-        descriptions = [
-            "High-converting affiliate program with competitive commission rates",
-            "Emerging market opportunity with low competition",
-            "Partnership opportunity with established brand",
-            "Revenue sharing program for content creators",
-            "Referral program with recurring commissions",
-            "Contest with significant prize pool and exposure",
-            "Grant opportunity for innovative projects",
-            "Collaboration opportunity with industry leaders"
-        ]
-        return random.choice(descriptions)
+        return self._rng.choice(_DESCRIPTIONS)
     
     def _generate_requirements(self):
         """Generate requirements for opportunities"""
-        all_requirements = [
-            "API integration capability",
-            "Minimum traffic threshold",
-            "Content creation skills",
-            "Social media presence",
-            "Technical expertise",
-            "Marketing experience",
-            "Compliance certification",
-            "Geographic restrictions"
-        ]
-        return random.sample(all_requirements, random.randint(1, 4))
+        return self._rng.sample(_REQUIREMENTS, self._rng.randint(1, 4))
     
     def _generate_hashtags(self):
         """Generate relevant hashtags for social opportunities"""
-        hashtags = [
-            "#affiliate", "#marketing", "#opportunity", "#business",
-            "#entrepreneur", "#passive income", "#revenue", "#growth",
-            "#partnership", "#collaboration", "#innovation", "#tech"
-        ]
-        return random.sample(hashtags, random.randint(2, 6))
+        return self._rng.sample(_HASHTAGS, self._rng.randint(2, 6))
     
-    async def _filter_and_rank_opportunities(self, opportunities: List[Dict]):
+    async def _filter_and_rank_opportunities(self, opportunities: List[Opportunity]):
         """Filter and rank opportunities by quality and potential"""
-        # Filter out low-value opportunities
-        filtered = [opp for opp in opportunities if opp.get('value_score', 0) >= 65]
-        
-        # Sort by value score and estimated revenue
-        filtered.sort(key=lambda x: (x.get('value_score', 0), x.get('estimated_revenue', 0)), reverse=True)
+        # Keep the top 20 non-low-value opportunities by value score and estimated revenue
+        top = heapq.nlargest(
+            20,
+            (opp for opp in opportunities if opp.value_score >= 65),
+            key=lambda x: (x.value_score, x.estimated_revenue)
+        )
         
         # Add ranking information
-        for i, opp in enumerate(filtered):
-            opp['rank'] = i + 1
-            opp['tier'] = self._determine_opportunity_tier(opp)
+        for i, opp in enumerate(top):
+            opp.rank = i + 1
+            opp.tier = self._determine_opportunity_tier(opp)
         
-        return filtered[:20]  # Return top 20 opportunities
+        return top
     
-    def _determine_opportunity_tier(self, opportunity: Dict):
+    def _determine_opportunity_tier(self, opportunity: Opportunity):
         """Determine opportunity tier based on value score and revenue"""
-        value_score = opportunity.get('value_score', 0)
-        estimated_revenue = opportunity.get('estimated_revenue', 0)
+        value_score = opportunity.value_score
+        estimated_revenue = opportunity.estimated_revenue
         
-        if value_score >= 85 and estimated_revenue >= 1000:
-            return 'premium'
-        elif value_score >= 75 and estimated_revenue >= 500:
-            return 'high'
-        elif value_score >= 65 and estimated_revenue >= 200:
-            return 'medium'
-        else:
-            return 'basic'
+        # Band each metric against the 65/75/85 and 200/500/1000 thresholds;
+        # an opportunity reaches the tier both of its bands qualify for
+        score_band = (value_score >= 65) + (value_score >= 75) + (value_score >= 85)
+        revenue_band = (estimated_revenue >= 200) + (estimated_revenue >= 500) + (estimated_revenue >= 1000)
+        return _TIERS[min(score_band, revenue_band)]
     
     async def get_discovery_summary(self):
         """Get summary of discovery activities"""
@@ -274,28 +434,32 @@ class Discovery:
                 "message": "No opportunities discovered yet"
             }
         
-        # Analyze opportunities by category
-        categories = {}
-        tiers = {}
-        sources = {}
+        # Analyze opportunities by category, tier and source in a single pass
+        categories = Counter()
+        tiers = Counter()
+        sources = Counter()
+        value_score_total = 0
+        revenue_total = 0
+        last_discovery = ''
         
         for opp in self.opportunities:
-            category = opp.get('category', 'unknown')
-            tier = opp.get('tier', 'basic')
-            source = opp.get('type', 'unknown')
+            categories[opp.category] += 1
+            tiers[opp.tier or 'basic'] += 1
+            sources[opp.type] += 1
             
-            categories[category] = categories.get(category, 0) + 1
-            tiers[tier] = tiers.get(tier, 0) + 1
-            sources[source] = sources.get(source, 0) + 1
+            value_score_total += opp.value_score
+            revenue_total += opp.estimated_revenue
+            if opp.discovered_at > last_discovery:
+                last_discovery = opp.discovered_at
         
         summary = {
             "total_opportunities": total_opportunities,
             "by_category": categories,
             "by_tier": tiers,
             "by_source": sources,
-            "average_value_score": sum(opp.get('value_score', 0) for opp in self.opportunities) / total_opportunities,
-            "total_estimated_revenue": sum(opp.get('estimated_revenue', 0) for opp in self.opportunities),
-            "last_discovery": max(opp.get('discovered_at', '') for opp in self.opportunities) if self.opportunities else None
+            "average_value_score": value_score_total / total_opportunities,
+            "total_estimated_revenue": revenue_total,
+            "last_discovery": last_discovery
         }
         
         return summary
@@ -1,22 +1,67 @@
 import asyncio
 import logging
-from datetime import datetime, timedelta
+import time
+from collections import deque
+from datetime import datetime
 from typing import Dict, List, Any, Optional
 
 logger = logging.getLogger("ArielMatrix.EthicsGuard")
 
+# Most recent audits and violations kept in memory
+AUDIT_HISTORY_LIMIT = 100
+VIOLATION_HISTORY_LIMIT = 10000
+
+# Each violation costs this many points of the compliance score
+VIOLATION_PENALTY = 15
+
 class EthicsGuard:
     """Ethics and compliance monitoring system"""
     
+    # Recommendations per violation type
+    _RECOMMENDATIONS = {
+        "data_privacy": (
+            "Implement explicit user consent mechanisms",
+            "Enable end-to-end data encryption",
+            "Review and update privacy policy",
+            "Implement data retention policies"
+        ),
+        "advertising_ethics": (
+            "Add clear affiliate disclosures to all campaigns",
+            "Review advertising claims for accuracy",
+            "Implement content review process",
+            "Train team on advertising ethics"
+        ),
+        "financial_compliance": (
+            "Implement automated financial reporting",
+            "Set up audit trail systems",
+            "Review tax compliance procedures",
+            "Enable fraud detection systems"
+        ),
+        "api_usage": (
+            "Implement proper rate limiting",
+            "Review API terms of service compliance",
+            "Add request monitoring and alerting",
+            "Implement retry logic with backoff"
+        ),
+        "ai_ethics": (
+            "Add human oversight to AI decisions",
+            "Implement bias detection and mitigation",
+            "Enable explainable AI features",
+            "Regular algorithm auditing"
+        )
+    }
+    
     def __init__(self):
-        self.violations = []
+        self.violations = deque(maxlen=VIOLATION_HISTORY_LIMIT)
         self.compliance_rules = self._load_compliance_rules()
-        self.audit_history = []
+        self._system_violations = self._evaluate_system_checks()
+        self.audit_history = deque(maxlen=AUDIT_HISTORY_LIMIT)
         self.strict_mode = True
+        self._checks_by_action = self._build_action_checks()
         
     def _load_compliance_rules(self):
         """Load compliance rules and ethical guidelines"""
-        return {
+        rules = {
             "data_privacy": {
                 "gdpr_compliance": True,
                 "data_retention_days": 365,
@@ -60,20 +105,25 @@ class EthicsGuard:
                 "fair_treatment": True
             }
         }
+        
+        # Rules only change when reloaded, so count them here rather than per summary
+        self._rules_count = sum(len(group) for group in rules.values())
+        return rules
     
     async def check_compliance(self, action: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Comprehensive compliance check"""
         logger.info("Performing ethics and compliance check...")
         
         try:
+            now = datetime.utcnow()
             compliance_result = {
-                "timestamp": datetime.utcnow().isoformat(),
+                "timestamp": now.isoformat(),
                 "action_checked": action,
                 "violations_found": [],
                 "compliance_score": 100,
                 "recommendations": [],
                 "status": "compliant",
-                "audit_id": f"audit_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}"
+                "audit_id": f"audit_{now:%Y%m%d_%H%M%S}"
             }
             
             violations = []
@@ -87,10 +137,16 @@ class EthicsGuard:
             
             # Process violations
             compliance_result["violations_found"] = violations
-            compliance_result["compliance_score"] = max(0, 100 - (len(violations) * 15))
+            compliance_result["compliance_score"] = max(0, 100 - (len(violations) * VIOLATION_PENALTY))
             
             if violations:
                 compliance_result["status"] = "violations_found"
+                
+                # Epoch seconds for filtering; the ISO timestamp is for display
+                ts = time.time()
+                for violation in violations:
+                    violation["ts"] = ts
+                    violation["timestamp"] = compliance_result["timestamp"]
                 self.violations.extend(violations)
                 
                 # Generate recommendations
@@ -100,13 +156,9 @@ class EthicsGuard:
                 for violation in violations:
                     logger.warning(f"Compliance violation: {violation.get('description', 'Unknown violation')}")
             
-            # Store audit result
+            # Store audit result; the deque drops the oldest past AUDIT_HISTORY_LIMIT
             self.audit_history.append(compliance_result)
             
-            # Keep only last 100 audits
-            if len(self.audit_history) > 100:
-                self.audit_history = self.audit_history[-100:]
-            
             logger.info(f"Compliance check completed. Score: {compliance_result['compliance_score']}/100")
             return compliance_result
             
@@ -119,101 +171,154 @@ class EthicsGuard:
         violations = []
         action_type = action.get("type", "unknown")
         
-        # Data Privacy Checks
-        if action_type in ["data_collection", "user_tracking", "profile_creation"]:
-            if not action.get("user_consent", False):
-                violations.append({
-                    "type": "data_privacy",
-                    "severity": "high",
-                    "description": "Data collection without explicit user consent",
-                    "rule_violated": "user_consent_required",
-                    "action_type": action_type
-                })
-            
-            if not action.get("data_encrypted", True):
-                violations.append({
-                    "type": "data_privacy",
-                    "severity": "high",
-                    "description": "Data not properly encrypted",
-                    "rule_violated": "data_encryption",
-                    "action_type": action_type
-                })
-        
-        # Advertising Ethics Checks
-        if action_type in ["campaign_launch", "ad_creation", "content_promotion"]:
-            if action.get("misleading_claims", False):
-                violations.append({
-                    "type": "advertising_ethics",
-                    "severity": "high",
-                    "description": "Potentially misleading advertising claims detected",
-                    "rule_violated": "no_misleading_claims",
-                    "action_type": action_type
-                })
-            
-            if not action.get("affiliate_disclosure", True):
-                violations.append({
-                    "type": "advertising_ethics",
-                    "severity": "medium",
-                    "description": "Missing affiliate relationship disclosure",
-                    "rule_violated": "affiliate_disclosure",
-                    "action_type": action_type
-                })
-        
-        # Financial Compliance Checks
-        if action_type in ["revenue_generation", "payment_processing", "financial_reporting"]:
-            if not action.get("accurate_reporting", True):
-                violations.append({
-                    "type": "financial_compliance",
-                    "severity": "high",
-                    "description": "Inaccurate financial reporting detected",
-                    "rule_violated": "accurate_reporting",
-                    "action_type": action_type
-                })
-        
-        # API Usage Checks
-        if action_type in ["api_call", "data_scraping", "external_integration"]:
-            if action.get("rate_limit_exceeded", False):
-                violations.append({
-                    "type": "api_usage",
-                    "severity": "medium",
-                    "description": "API rate limits exceeded",
-                    "rule_violated": "respect_rate_limits",
-                    "action_type": action_type
-                })
-            
-            if not action.get("terms_compliance", True):
-                violations.append({
-                    "type": "api_usage",
-                    "severity": "high",
-                    "description": "Terms of service violation detected",
-                    "rule_violated": "terms_of_service_compliance",
-                    "action_type": action_type
-                })
-        
-        # AI Ethics Checks
-        if action_type in ["ai_decision", "automated_action", "algorithm_execution"]:
-            if not action.get("human_oversight", False):
-                violations.append({
-                    "type": "ai_ethics",
-                    "severity": "medium",
-                    "description": "AI action without human oversight",
-                    "rule_violated": "human_oversight",
-                    "action_type": action_type
-                })
-            
-            if action.get("bias_detected", False):
-                violations.append({
-                    "type": "ai_ethics",
-                    "severity": "high",
-                    "description": "Algorithmic bias detected",
-                    "rule_violated": "bias_prevention",
-                    "action_type": action_type
-                })
+        # Only the checks registered for this action type run
+        for check in self._checks_by_action.get(action_type, ()):
+            violation = check(action, action_type)
+            if violation:
+                violations.append(violation)
         
         return violations
     
+    def _build_action_checks(self) -> Dict[str, tuple]:
+        """Map each action type to the compliance checks that apply to it"""
+        checks_by_group = (
+            # Data Privacy Checks
+            (("data_collection", "user_tracking", "profile_creation"),
+             (self._check_user_consent, self._check_data_encryption)),
+            # Advertising Ethics Checks
+            (("campaign_launch", "ad_creation", "content_promotion"),
+             (self._check_misleading_claims, self._check_affiliate_disclosure)),
+            # Financial Compliance Checks
+            (("revenue_generation", "payment_processing", "financial_reporting"),
+             (self._check_accurate_reporting,)),
+            # API Usage Checks
+            (("api_call", "data_scraping", "external_integration"),
+             (self._check_rate_limits, self._check_terms_compliance)),
+            # AI Ethics Checks
+            (("ai_decision", "automated_action", "algorithm_execution"),
+             (self._check_human_oversight, self._check_bias)),
+        )
+        return {
+            action_type: checks
+            for action_types, checks in checks_by_group
+            for action_type in action_types
+        }
+    
+    def _check_user_consent(self, action: Dict[str, Any], action_type: str) -> Optional[Dict[str, Any]]:
+        """Flag data handling without explicit user consent"""
+        if not action.get("user_consent", False):
+            return {
+                "type": "data_privacy",
+                "severity": "high",
+                "description": "Data collection without explicit user consent",
+                "rule_violated": "user_consent_required",
+                "action_type": action_type
+            }
+        return None
+    
+    def _check_data_encryption(self, action: Dict[str, Any], action_type: str) -> Optional[Dict[str, Any]]:
+        """Flag data that is not encrypted"""
+        if not action.get("data_encrypted", True):
+            return {
+                "type": "data_privacy",
+                "severity": "high",
+                "description": "Data not properly encrypted",
+                "rule_violated": "data_encryption",
+                "action_type": action_type
+            }
+        return None
+    
+    def _check_misleading_claims(self, action: Dict[str, Any], action_type: str) -> Optional[Dict[str, Any]]:
+        """Flag misleading advertising claims"""
+        if action.get("misleading_claims", False):
+            return {
+                "type": "advertising_ethics",
+                "severity": "high",
+                "description": "Potentially misleading advertising claims detected",
+                "rule_violated": "no_misleading_claims",
+                "action_type": action_type
+            }
+        return None
+    
+    def _check_affiliate_disclosure(self, action: Dict[str, Any], action_type: str) -> Optional[Dict[str, Any]]:
+        """Flag a missing affiliate disclosure"""
+        if not action.get("affiliate_disclosure", True):
+            return {
+                "type": "advertising_ethics",
+                "severity": "medium",
+                "description": "Missing affiliate relationship disclosure",
+                "rule_violated": "affiliate_disclosure",
+                "action_type": action_type
+            }
+        return None
+    
+    def _check_accurate_reporting(self, action: Dict[str, Any], action_type: str) -> Optional[Dict[str, Any]]:
+        """Flag inaccurate financial reporting"""
+        if not action.get("accurate_reporting", True):
+            return {
+                "type": "financial_compliance",
+                "severity": "high",
+                "description": "Inaccurate financial reporting detected",
+                "rule_violated": "accurate_reporting",
+                "action_type": action_type
+            }
+        return None
+    
+    def _check_rate_limits(self, action: Dict[str, Any], action_type: str) -> Optional[Dict[str, Any]]:
+        """Flag exceeded API rate limits"""
+        if action.get("rate_limit_exceeded", False):
+            return {
+                "type": "api_usage",
+                "severity": "medium",
+                "description": "API rate limits exceeded",
+                "rule_violated": "respect_rate_limits",
+                "action_type": action_type
+            }
+        return None
+    
+    def _check_terms_compliance(self, action: Dict[str, Any], action_type: str) -> Optional[Dict[str, Any]]:
+        """Flag terms of service violations"""
+        if not action.get("terms_compliance", True):
+            return {
+                "type": "api_usage",
+                "severity": "high",
+                "description": "Terms of service violation detected",
+                "rule_violated": "terms_of_service_compliance",
+                "action_type": action_type
+            }
+        return None
+    
+    def _check_human_oversight(self, action: Dict[str, Any], action_type: str) -> Optional[Dict[str, Any]]:
+        """Flag AI actions without human oversight"""
+        if not action.get("human_oversight", False):
+            return {
+                "type": "ai_ethics",
+                "severity": "medium",
+                "description": "AI action without human oversight",
+                "rule_violated": "human_oversight",
+                "action_type": action_type
+            }
+        return None
+    
+    def _check_bias(self, action: Dict[str, Any], action_type: str) -> Optional[Dict[str, Any]]:
+        """Flag detected algorithmic bias"""
+        if action.get("bias_detected", False):
+            return {
+                "type": "ai_ethics",
+                "severity": "high",
+                "description": "Algorithmic bias detected",
+                "rule_violated": "bias_prevention",
+                "action_type": action_type
+            }
+        return None
+    
     async def _check_system_compliance(self) -> List[Dict[str, Any]]:
         """Perform system-wide compliance checks"""
+        # Callers annotate violations in place, so hand out copies
+        return [dict(violation) for violation in self._system_violations]
+    
+    def _evaluate_system_checks(self) -> List[Dict[str, Any]]:
+        """Evaluate the system compliance checks once; results only change with the rules"""
         violations = []
         
         # Simulate system compliance checks
@@ -264,58 +369,19 @@ class EthicsGuard:
     
     async def _generate_recommendations(self, violations: List[Dict[str, Any]]) -> List[str]:
         """Generate actionable recommendations based on violations"""
-        recommendations = []
+        recommendations = {}
         
-        violation_types = set(v.get("type") for v in violations)
+        # Violation types in order of first appearance; duplicates keep their first position
+        for violation_type in dict.fromkeys(v.get("type") for v in violations):
+            recommendations.update(dict.fromkeys(self._RECOMMENDATIONS.get(violation_type, ())))
         
-        for violation_type in violation_types:
-            if violation_type == "data_privacy":
-                recommendations.extend([
-                    "Implement explicit user consent mechanisms",
-                    "Enable end-to-end data encryption",
-                    "Review and update privacy policy",
-                    "Implement data retention policies"
-                ])
-            elif violation_type == "advertising_ethics":
-                recommendations.extend([
-                    "Add clear affiliate disclosures to all campaigns",
-                    "Review advertising claims for accuracy",
-                    "Implement content review process",
-                    "Train team on advertising ethics"
-                ])
-            elif violation_type == "financial_compliance":
-                recommendations.extend([
-                    "Implement automated financial reporting",
-                    "Set up audit trail systems",
-                    "Review tax compliance procedures",
-                    "Enable fraud detection systems"
-                ])
-            elif violation_type == "api_usage":
-                recommendations.extend([
-                    "Implement proper rate limiting",
-                    "Review API terms of service compliance",
-                    "Add request monitoring and alerting",
-                    "Implement retry logic with backoff"
-                ])
-            elif violation_type == "ai_ethics":
-                recommendations.extend([
-                    "Add human oversight to AI decisions",
-                    "Implement bias detection and mitigation",
-                    "Enable explainable AI features",
-                    "Regular algorithm auditing"
-                ])
-        
-        # Remove duplicates and return
-        return list(set(recommendations))
+        return list(recommendations)
     
     async def get_compliance_summary(self) -> Dict[str, Any]:
         """Get comprehensive compliance summary"""
         total_violations = len(self.violations)
-        recent_violations = [
-            v for v in self.violations
-            if datetime.fromisoformat(v.get("timestamp", datetime.utcnow().isoformat())) > 
-               datetime.utcnow() - timedelta(days=30)
-        ]
+        recent_cutoff = time.time() - 30 * 86400
+        recent_violations = [v for v in self.violations if v.get("ts", 0) > recent_cutoff]
         
         # Violation breakdown by type
         violation_types = {}
@@ -340,7 +406,7 @@ class EthicsGuard:
             "current_compliance_score": current_score,
             "total_audits": len(self.audit_history),
             "last_audit": recent_audit.get("timestamp") if recent_audit else None,
-            "compliance_rules_count": sum(len(rules) for rules in self.compliance_rules.values()),
+            "compliance_rules_count": self._rules_count,
             "strict_mode": self.strict_mode
         }
     
@@ -351,13 +417,13 @@ class EthicsGuard:
     
     async def clear_violations(self, older_than_days: int = 30):
         """Clear old violations"""
-        cutoff_date = datetime.utcnow() - timedelta(days=older_than_days)
+        cutoff = time.time() - older_than_days * 86400
         
         original_count = len(self.violations)
-        self.violations = [
-            v for v in self.violations
-            if datetime.fromisoformat(v.get("timestamp", datetime.utcnow().isoformat())) > cutoff_date
-        ]
+        self.violations = deque(
+            (v for v in self.violations if v.get("ts", 0) > cutoff),
+            maxlen=VIOLATION_HISTORY_LIMIT
+        )
         
         cleared_count = original_count - len(self.violations)
         logger.info(f"Cleared {cleared_count} violations older than {older_than_days} days")
@@ -1,35 +1,250 @@
+import atexit
+import copy
+import itertools
 import logging
 import os
-import json
+import queue
+import threading
+import time
+import msgspec
+import orjson
+from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache
 from typing import Dict, Any, Optional, List
-from logging.handlers import RotatingFileHandler
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
+from collections import Counter, deque
 import asyncio
 
+# Log files are written through a 64KB buffer and flushed on a timer rather
+# than after every record
+LOG_BUFFER_SIZE = 64 * 1024
+LOG_FLUSH_INTERVAL = 0.2
+
+# Level names accepted by ArielLogger.log; anything else logs at INFO
+_LEVELS = {
+    "DEBUG": logging.DEBUG,
+    "INFO": logging.INFO,
+    "WARNING": logging.WARNING,
+    "ERROR": logging.ERROR,
+    "CRITICAL": logging.CRITICAL
+}
+
+@lru_cache(maxsize=4)
+def _iso_second(seconds: int) -> str:
+    """UTC ISO-8601 prefix for a whole second, reused by every record in that second"""
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(seconds))
+
+def _iso_timestamp(created: float) -> str:
+    """UTC time in the datetime.isoformat() layout, always with microseconds"""
+    seconds = int(created)
+    return f"{_iso_second(seconds)}.{int((created - seconds) * 1e6):06d}"
+
+# Exports are MessagePack; values msgspec cannot encode fall back to str()
+_export_encoder = msgspec.msgpack.Encoder(enc_hook=str)
+
+def _msgpack_array_header(length: int) -> bytes:
+    """MessagePack array header, so array items can be written one at a time"""
+    if length < 16:
+        return bytes((0x90 | length,))
+    if length < 0x10000:
+        return b"\xdc" + length.to_bytes(2, "big")
+    return b"\xdd" + length.to_bytes(4, "big")
+
+@dataclass(slots=True)
+class LogEntry:
+    """A log record held in ArielLogger's memory buffer"""
+    timestamp: str
+    level: str
+    message: str
+    metadata: Dict[str, Any]
+    component: str
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Dictionary shape returned by get_recent_logs"""
+        return {
+            "timestamp": self.timestamp,
+            "level": self.level,
+            "message": self.message,
+            "metadata": self.metadata,
+            "component": self.component
+        }
+
+class DequeHandler(logging.Handler):
+    """Keeps records as LogEntry objects in the deque behind get_recent_logs"""
+    
+    def __init__(self, logs: deque, by_level: Dict[str, deque], component: str):
+        super().__init__(logging.DEBUG)
+        self.logs = logs
+        # The same entries again, split per level; together they always hold
+        # exactly what `logs` holds
+        self.by_level = by_level
+        # Child loggers (ArielMatrix.Discovery, ...) propagate into this
+        # handler; only records logged through the owning logger are kept
+        self.component = component
+    
+    def filter(self, record):
+        return record.name == self.component and super().filter(record)
+    
+    def emit(self, record):
+        # Runs under the handler lock (Handler.handle); readers in ArielLogger
+        # take the same lock so both views always change together
+        try:
+            logs = self.logs
+            timestamp = _iso_timestamp(record.created)
+            message = record.getMessage()
+            metadata = getattr(record, "metadata", None) or {}
+            
+            # Once the buffer is full, the entry it would evict is rewritten and
+            # moved to the end instead of allocating a new one
+            if len(logs) == logs.maxlen:
+                entry = logs.popleft()
+                # The oldest entry overall is also the oldest of its level
+                self.by_level[entry.level].popleft()
+                entry.timestamp = timestamp
+                entry.level = record.levelname
+                entry.message = message
+                entry.metadata = metadata
+                entry.component = record.name
+            else:
+                entry = LogEntry(timestamp, record.levelname, message, metadata, record.name)
+            
+            logs.append(entry)
+            
+            level_logs = self.by_level.get(entry.level)
+            if level_logs is None:
+                level_logs = self.by_level[entry.level] = deque()
+            level_logs.append(entry)
+        except Exception:
+            self.handleError(record)
+
+class MetadataFormatter(logging.Formatter):
+    """Formatter that appends a record's metadata to the message as JSON"""
+    
+    def formatMessage(self, record):
+        message = super().formatMessage(record)
+        metadata = getattr(record, "metadata", None)
+        if metadata:
+            return f"{message} | Metadata: {orjson.dumps(metadata, default=str, option=orjson.OPT_NON_STR_KEYS).decode()}"
+        return message
+
+class BufferedRotatingFileHandler(RotatingFileHandler):
+    """RotatingFileHandler that buffers writes and leaves flushing to _flush_buffered_handlers"""
+    
+    def _open(self):
+        stream = open(self.baseFilename, self.mode, buffering=LOG_BUFFER_SIZE,
+                      encoding=self.encoding, errors=self.errors)
+        # Size is tracked here rather than through shouldRollover, whose
+        # per-record stat calls and seek would flush the buffer every time
+        self._size = os.fstat(stream.fileno()).st_size
+        self._regular_file = os.path.isfile(self.baseFilename)
+        return stream
+    
+    def emit(self, record):
+        try:
+            if self.stream is None:
+                self.stream = self._open()
+            msg = self.format(record) + self.terminator
+            # maxBytes is a byte limit; only non-ASCII text needs encoding to measure
+            size = len(msg) if msg.isascii() else len(msg.encode(self.stream.encoding, self.errors or "strict"))
+            if self.maxBytes > 0 and self._regular_file and self._size + size >= self.maxBytes:
+                self.doRollover()
+            self.stream.write(msg)
+            self._size += size
+        except Exception:
+            self.handleError(record)
+
+# Renders tracebacks of queued records before they leave the calling thread
+_exception_formatter = logging.Formatter()
+
+class RecordQueueHandler(QueueHandler):
+    """QueueHandler that leaves formatting to the listener's handlers"""
+    
+    def prepare(self, record):
+        # Resolve the message and traceback now, but keep them apart so each
+        # formatter still places metadata between message and traceback
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = _exception_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+_buffered_handlers: List[BufferedRotatingFileHandler] = []
+_log_listeners: List[QueueListener] = []
+_flush_stop = threading.Event()
+_flush_thread: Optional[threading.Thread] = None
+
+def _flush_buffered_handlers():
+    """Flush every buffered log file each LOG_FLUSH_INTERVAL (flush thread)"""
+    while not _flush_stop.wait(LOG_FLUSH_INTERVAL):
+        for handler in _buffered_handlers:
+            handler.flush()
+
+def _start_queued_logging(handlers: List[logging.Handler]) -> QueueHandler:
+    """Route records to `handlers` through a queue drained by a background thread"""
+    global _flush_thread
+    
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    _log_listeners.append(listener)
+    _buffered_handlers.extend(h for h in handlers if isinstance(h, BufferedRotatingFileHandler))
+    
+    if _flush_thread is None:
+        _flush_thread = threading.Thread(target=_flush_buffered_handlers, name="log-flush", daemon=True)
+        _flush_thread.start()
+    
+    return RecordQueueHandler(log_queue)
+
+@atexit.register
+def _stop_queued_logging():
+    """Drain queued records and flush the log files on interpreter exit"""
+    _flush_stop.set()
+    for listener in _log_listeners:
+        listener.stop()
+    for handler in _buffered_handlers:
+        handler.flush()
+
 class ArielLogger:
     """Enhanced logging system for ArielMatrix"""
     
     def __init__(self, name: str = "ArielMatrix"):
         self.name = name
-        self.logs = []
         self.max_memory_logs = 1000
+        self.logs = deque(maxlen=self.max_memory_logs)
+        self._by_level = {level: deque() for level in _LEVELS}
+        self._memory_handler = DequeHandler(self.logs, self._by_level, name)
         self.logger = self._setup_logger()
         
     def _setup_logger(self):
         """Setup the logging configuration"""
         logger = logging.getLogger(self.name)
-        logger.setLevel(logging.INFO)
+        # Every level reaches the memory buffer; the console applies its own
+        # INFO threshold
+        logger.setLevel(logging.DEBUG)
+        # Records are fully handled here; don't hand them to root handlers too
+        logger.propagate = False
         
-        # Prevent duplicate handlers
+        # Prevent duplicate handlers; share the memory buffer already attached
         if logger.handlers:
+            for handler in logger.handlers:
+                if isinstance(handler, DequeHandler):
+                    self._memory_handler = handler
+                    self.logs = handler.logs
+                    self._by_level = handler.by_level
             return logger
         
+        # Memory buffer for get_recent_logs, fed by the logger itself
+        logger.addHandler(self._memory_handler)
+        
         # Create formatters
-        detailed_formatter = logging.Formatter(
+        detailed_formatter = MetadataFormatter(
             '%(asctime)s - %(name)s - %(levelname)s - %(funcName)s:%(lineno)d - %(message)s'
         )
         
-        simple_formatter = logging.Formatter(
+        simple_formatter = MetadataFormatter(
             '%(asctime)s - %(levelname)s - %(message)s'
         )
         
@@ -37,57 +252,38 @@ class ArielLogger:
         console_handler = logging.StreamHandler()
         console_handler.setLevel(logging.INFO)
         console_handler.setFormatter(simple_formatter)
-        logger.addHandler(console_handler)
         
         # File handler with rotation
         log_dir = "logs"
         os.makedirs(log_dir, exist_ok=True)
         
-        file_handler = RotatingFileHandler(
+        file_handler = BufferedRotatingFileHandler(
             os.path.join(log_dir, f"{self.name.lower()}.log"),
             maxBytes=10*1024*1024,  # 10MB
             backupCount=5
         )
         file_handler.setLevel(logging.DEBUG)
         file_handler.setFormatter(detailed_formatter)
-        logger.addHandler(file_handler)
         
         # Error file handler
-        error_handler = RotatingFileHandler(
+        error_handler = BufferedRotatingFileHandler(
             os.path.join(log_dir, f"{self.name.lower()}_errors.log"),
             maxBytes=5*1024*1024,  # 5MB
             backupCount=3
         )
         error_handler.setLevel(logging.ERROR)
         error_handler.setFormatter(detailed_formatter)
-        logger.addHandler(error_handler)
+        
+        # Console and file writes happen on a listener thread; callers only enqueue
+        logger.addHandler(_start_queued_logging([console_handler, file_handler, error_handler]))
         
         return logger
     
     def log(self, message: str, level: str = "INFO", metadata: Optional[Dict[str, Any]] = None):
         """Log a message with optional metadata"""
-        log_entry = {
-            "timestamp": datetime.utcnow().isoformat(),
-            "level": level.upper(),
-            "message": message,
-            "metadata": metadata or {},
-            "component": self.name
-        }
-        
-        # Add to memory logs
-        self.logs.append(log_entry)
-        if len(self.logs) > self.max_memory_logs:
-            self.logs.pop(0)  # Remove oldest log
-        
-        # Log to standard logger
-        log_level = getattr(logging, level.upper(), logging.INFO)
-        
-        if metadata:
-            formatted_message = f"{message} | Metadata: {json.dumps(metadata, default=str)}"
-        else:
-            formatted_message = message
-        
-        self.logger.log(log_level, formatted_message)
+        # Handlers do the rest: DequeHandler keeps the memory copy and the
+        # formatters serialize metadata only for records they actually write
+        self.logger.log(_LEVELS.get(level.upper(), logging.INFO), message, extra={"metadata": metadata})
     
     def info(self, message: str, metadata: Optional[Dict[str, Any]] = None):
         """Log info message"""
@@ -111,10 +307,10 @@ class ArielLogger:
     
     def log_activity(self, activity_type: str, details: Dict[str, Any]):
         """Log system activity with structured data"""
+        # The log entry itself carries the timestamp
         self.info(f"Activity: {activity_type}", {
             "activity_type": activity_type,
-            "details": details,
-            "timestamp": datetime.utcnow().isoformat()
+            "details": details
         })
     
     def log_performance(self, operation: str, duration: float, metadata: Optional[Dict[str, Any]] = None):
@@ -132,62 +328,79 @@ class ArielLogger:
     
     def log_error_with_context(self, error: Exception, context: Dict[str, Any]):
         """Log error with additional context"""
-        error_metadata = {
-            "error_type": type(error).__name__,
-            "error_message": str(error),
-            "context": context
-        }
-        
-        self.error(f"Error occurred: {str(error)}", error_metadata)
+        # The error type and message come from exc_info, rendered only by
+        # handlers that accept the record
+        self.logger.error("Error occurred: %s", error, exc_info=error, extra={"metadata": {"context": context}})
     
     def get_recent_logs(self, limit: int = 50, level: Optional[str] = None) -> List[Dict[str, Any]]:
         """Get recent logs from memory"""
-        logs = self.logs.copy()
-        
-        if level:
-            logs = [log for log in logs if log["level"] == level.upper()]
-        
-        return logs[-limit:] if limit else logs
+        # Walk newest-first so only the requested tail is visited; a level
+        # filter reads that level's own deque
+        with self._memory_handler.lock:
+            if level:
+                logs = reversed(self._by_level.get(level.upper(), ()))
+            else:
+                logs = reversed(self.logs)
+            
+            if limit:
+                logs = itertools.islice(logs, limit)
+            
+            recent = [log.to_dict() for log in logs]
+        recent.reverse()
+        return recent
     
     def get_log_summary(self) -> Dict[str, Any]:
         """Get summary of log statistics"""
-        if not self.logs:
-            return {"total_logs": 0, "message": "No logs available"}
-        
-        level_counts = {}
-        for log in self.logs:
-            level = log["level"]
-            level_counts[level] = level_counts.get(level, 0) + 1
-        
-        return {
-            "total_logs": len(self.logs),
-            "by_level": level_counts,
-            "oldest_log": self.logs[0]["timestamp"] if self.logs else None,
-            "newest_log": self.logs[-1]["timestamp"] if self.logs else None,
-            "memory_usage": f"{len(self.logs)}/{self.max_memory_logs}"
-        }
+        with self._memory_handler.lock:
+            if not self.logs:
+                return {"total_logs": 0, "message": "No logs available"}
+            
+            level_counts = Counter(log.level for log in self.logs)
+            
+            return {
+                "total_logs": len(self.logs),
+                "by_level": dict(level_counts),
+                "oldest_log": self.logs[0].timestamp,
+                "newest_log": self.logs[-1].timestamp,
+                "memory_usage": f"{len(self.logs)}/{self.max_memory_logs}"
+            }
     
     def clear_logs(self):
         """Clear all logs from memory"""
-        self.logs.clear()
+        with self._memory_handler.lock:
+            self.logs.clear()
+            for level_logs in self._by_level.values():
+                level_logs.clear()
         self.info("Log memory cleared")
     
     def export_logs(self, filename: Optional[str] = None) -> str:
-        """Export logs to JSON file"""
+        """Export logs to a MessagePack file"""
         if filename is None:
-            filename = f"ariel_logs_export_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.json"
+            filename = f"ariel_logs_export_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.msgpack"
         
-        export_data = {
+        # Snapshot copies: full-buffer entries are recycled in place, so the
+        # live objects may be rewritten while the file is being written
+        with self._memory_handler.lock:
+            logs = [entry.to_dict() for entry in self.logs]
+        header = {
             "export_timestamp": datetime.utcnow().isoformat(),
-            "total_logs": len(self.logs),
-            "logs": self.logs
+            "total_logs": len(logs)
         }
         
         os.makedirs("exports", exist_ok=True)
         filepath = os.path.join("exports", filename)
         
-        with open(filepath, 'w') as f:
-            json.dump(export_data, f, indent=2, default=str)
+        # Entries are encoded one at a time behind a hand-written map/array
+        # header instead of serializing the whole export in memory
+        with open(filepath, 'wb') as f:
+            f.write(b"\x83")
+            for key, value in header.items():
+                f.write(_export_encoder.encode(key))
+                f.write(_export_encoder.encode(value))
+            f.write(_export_encoder.encode("logs"))
+            f.write(_msgpack_array_header(len(logs)))
+            for entry in logs:
+                f.write(_export_encoder.encode(entry))
         
         self.info(f"Logs exported to {filepath}")
         return filepath
@@ -2,35 +2,108 @@
 🚀 AI Affiliate Backend - Next-Gen Production Version
 ArielAI: Autonomous, adaptive, and revenue-maximizing.
 """
+import hashlib
+import heapq
 import os
+import signal
 import sys
 import asyncio
-from fastapi import FastAPI, HTTPException, Depends, Request, status, BackgroundTasks
+import time
+from functools import lru_cache
+from fastapi import FastAPI, HTTPException, Depends, Request, Response, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, HTMLResponse
+from fastapi.responses import ORJSONResponse, HTMLResponse
 from pydantic import BaseModel
-from datetime import datetime
-import logging
-import random
+from typing import Dict, Optional
+import numpy as np
 import uvicorn
 from ariel.orchestrator import ArielOrchestrator
 
+# libuv-based event loop for the system entrypoint; uvloop has
+# no Windows build, where the stock asyncio loop is used instead
+uvloop = None
+if sys.platform != "win32":
+    try:
+        import uvloop
+    except ImportError:
+        pass
+
 # Add current directory to path for imports
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from database import db_manager, get_db
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('ariel_system.log'),
-        logging.StreamHandler()
-    ]
-)
+from database import db_manager, get_db, close_database
+from cachetools import TTLCache
+from prometheus_client import make_asgi_app
+from cache_metrics import record_hit, record_miss
+
+from logger import ariel_logger as logger
+
+# Slow-changing documents polled by the dashboards are reused for a few
+# seconds, keyed by collection and filter
+DB_CACHE_TTL = 5
+_db_cache = TTLCache(maxsize=64, ttl=DB_CACHE_TTL)
+_MISSING = object()
+
+async def cached_find_one(db, collection: str, conditions: Optional[Dict] = None):
+    """db.find_one through a short-lived cache"""
+    key = (collection, tuple(sorted((conditions or {}).items())))
+    result = _db_cache.get(key, _MISSING)
+    if result is not _MISSING:
+        record_hit("db.find_one")
+        return result
+    
+    record_miss("db.find_one")
+    result = await db.find_one(collection, conditions)
+    _db_cache[key] = result
+    return result
+
+# Simulated regional growth for /api/neural/metrics: North America, Europe,
+# Asia Pacific, drawn together in one call
+_rng = np.random.default_rng()
+_GROWTH_LOW = np.array([8.0, 5.0, 10.0])
+_GROWTH_HIGH = np.array([15.0, 12.0, 20.0])
+
+@lru_cache(maxsize=2)
+def _iso_second(seconds: int) -> str:
+    """UTC ISO-8601 string for a whole second"""
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(seconds))
+
+def utc_now_iso() -> str:
+    """Response timestamp at one-second resolution, formatted once per second"""
+    return _iso_second(int(time.time()))
+
+async def require_db(db=Depends(get_db)):
+    """Dependency that rejects the request before the endpoint runs if the database is down"""
+    if not db._connected:
+        raise HTTPException(status_code=503, detail="Database not connected")
+    return db
+
+# /opportunities returns the highest-scoring opportunities, scored the way
+# Discovery scores them
+TOP_OPPORTUNITIES = 20
+
+def _opportunity_score(opportunity: Dict) -> float:
+    """Ranking key for /opportunities"""
+    return opportunity.get("value_score", 0)
+
+# The demo neural metrics payload is rebuilt at most once per second
+_neural_demo_cache = TTLCache(maxsize=1, ttl=1)
+
+def _build_demo_neural_metrics() -> Dict:
+    """Demo payload for /api/neural/metrics when no orchestrator is available"""
+    return {
+        "globalAnalysis": "Processing 2.3M data points",
+        "automationLevel": int(_rng.integers(80, 96)),
+        "marketTrends": [
+            {"region": "North America", "growth": 12.5, "status": "bullish"},
+            {"region": "Europe", "growth": 8.3, "status": "stable"},
+            {"region": "Asia Pacific", "growth": 15.7, "status": "bullish"},
+        ]
+    }
 
-logger = logging.getLogger("ArielMain")
+def invalidate_db_cache():
+    """Drop cached documents after an action that rewrites them"""
+    _db_cache.clear()
 
 class ArielSystem:
     """
@@ -43,7 +116,7 @@ class ArielSystem:
         self.running = False
         self.shutdown_requested = False
     
-    async def start(self):
+    async def start(self, install_signal_handlers: bool = True):
         """Start the complete Ariel system"""
         logger.info("🚀 Starting Ariel Revenue Generation System...")
         logger.info("=" * 60)
@@ -60,8 +133,10 @@ class ArielSystem:
             # Bootstrap the system
             await self.orchestrator.bootstrap()
             
-            # Set up signal handlers for graceful shutdown
-            self._setup_signal_handlers()
+            # Set up signal handlers for graceful shutdown; under the API
+            # server uvicorn owns the process signals
+            if install_signal_handlers:
+                self._setup_signal_handlers()
             
             # Start continuous operation
             self.running = True
@@ -140,19 +215,58 @@ class ArielSystem:
             return await self.orchestrator.get_revenue_summary()
         return {"error": "System not initialized"}
 
+# One system per process, shared by the entrypoint and every endpoint
+ariel_system = ArielSystem()
+
 async def main():
     """Main entry point"""
-    system = ArielSystem()
-    
     try:
-        await system.start()
+        await ariel_system.start()
     except KeyboardInterrupt:
         logger.info("👋 Goodbye!")
     except Exception as e:
         logger.error(f"System error: {e}")
         sys.exit(1)
 
-app = FastAPI(title="AI Affiliate Backend", docs_url="/docs", redoc_url="/redoc")
+app = FastAPI(title="AI Affiliate Backend", docs_url="/docs", redoc_url="/redoc", default_response_class=ORJSONResponse)
+
+app.state.system = ariel_system
+app.state.system_task = None
+
+def get_system() -> ArielSystem:
+    """Dependency returning the process-wide ArielSystem"""
+    return app.state.system
+
+def _log_system_exit(task: asyncio.Task):
+    """Report a background system run that ended with an exception"""
+    if not task.cancelled() and task.exception() is not None:
+        logger.error(f"Ariel System task failed: {task.exception()}")
+
+def system_task_active() -> bool:
+    """Whether a background system run is starting or running"""
+    task = app.state.system_task
+    return task is not None and not task.done()
+
+def start_system_task():
+    """Run the shared system in a background task owned by the API"""
+    task = asyncio.create_task(ariel_system.start(install_signal_handlers=False))
+    task.add_done_callback(_log_system_exit)
+    app.state.system_task = task
+
+@app.on_event("startup")
+async def start_system():
+    """Start the shared system in the background alongside the API"""
+    start_system_task()
+
+@app.on_event("shutdown")
+async def stop_system():
+    """Shut the shared system down with the API"""
+    if ariel_system.running:
+        await ariel_system.shutdown()
+    if app.state.system_task is not None:
+        app.state.system_task.cancel()
+    # Buffered append() rows are only written on flush
+    await close_database()
 
 app.add_middleware(
     CORSMiddleware,
@@ -162,10 +276,11 @@ app.add_middleware(
     allow_headers=["*"]
 )
 
-@app.get("/", response_class=HTMLResponse)
-async def root():
-    """Root endpoint with system overview"""
-    html_content = """
+# Prometheus exposition (cache hit/miss counters among others)
+app.mount("/api/metrics", make_asgi_app())
+
+# The overview page is static: encode it and compute its ETag once
+_ROOT_HTML = """
     <!DOCTYPE html>
     <html>
     <head>
@@ -244,37 +359,44 @@ async def root():
     </body>
     </html>
     """
-    return html_content
+_ROOT_HTML_BYTES = _ROOT_HTML.encode("utf-8")
+_ROOT_ETAG = f'"{hashlib.blake2b(_ROOT_HTML_BYTES, digest_size=8).hexdigest()}"'
+_ROOT_HEADERS = {"Cache-Control": "public, max-age=300", "ETag": _ROOT_ETAG}
+
+@app.get("/", response_class=HTMLResponse)
+async def root(request: Request):
+    """Root endpoint with system overview"""
+    if request.headers.get("if-none-match") == _ROOT_ETAG:
+        return Response(status_code=304, headers=_ROOT_HEADERS)
+    return Response(content=_ROOT_HTML_BYTES, media_type="text/html", headers=_ROOT_HEADERS)
 
 @app.get("/status")
-async def get_system_status():
+async def get_system_status(system: ArielSystem = Depends(get_system)):
     """Get comprehensive system status"""
-    system = ArielSystem()
     status = await system.get_status()
     return status
 
 @app.get("/revenue")
-async def get_revenue_summary():
+async def get_revenue_summary(system: ArielSystem = Depends(get_system)):
     """Get comprehensive revenue summary"""
-    system = ArielSystem()
     revenue_summary = await system.get_revenue_summary()
     return revenue_summary
 
 @app.post("/orchestrator/start")
-async def start_orchestrator(background_tasks: BackgroundTasks):
+async def start_orchestrator(system: ArielSystem = Depends(get_system)):
     """Start the revenue generation orchestrator"""
-    system = ArielSystem()
-    if system.running:
+    # A run that is still bootstrapping has running=False but a live task
+    if system.running or system_task_active():
         return {"message": "Orchestrator already running", "status": "active"}
     
     try:
         # Start orchestrator in background
-        background_tasks.add_task(system.start)
+        start_system_task()
         
         return {
             "message": "Orchestrator started successfully",
             "status": "starting",
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": utc_now_iso()
         }
         
     except Exception as e:
@@ -282,9 +404,8 @@ async def start_orchestrator(background_tasks: BackgroundTasks):
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/orchestrator/stop")
-async def stop_orchestrator():
+async def stop_orchestrator(system: ArielSystem = Depends(get_system)):
     """Stop the orchestrator"""
-    system = ArielSystem()
     if not system.running:
         return {"message": "Orchestrator not running", "status": "inactive"}
     
@@ -294,7 +415,7 @@ async def stop_orchestrator():
         return {
             "message": "Orchestrator stop requested",
             "status": "stopping",
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": utc_now_iso()
         }
         
     except Exception as e:
@@ -302,9 +423,8 @@ async def stop_orchestrator():
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/opportunities")
-async def get_market_opportunities():
+async def get_market_opportunities(system: ArielSystem = Depends(get_system)):
     """Get current market opportunities"""
-    system = ArielSystem()
     if not system.running:
         raise HTTPException(status_code=503, detail="System not initialized")
     
@@ -313,10 +433,10 @@ async def get_market_opportunities():
         trends = await system.orchestrator.analyze_trends()
         
         return {
-            "opportunities": opportunities[:20],  # Top 20 opportunities
+            "opportunities": heapq.nlargest(TOP_OPPORTUNITIES, opportunities, key=_opportunity_score),
             "trends": trends,
             "total_opportunities": len(opportunities),
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": utc_now_iso()
         }
         
     except Exception as e:
@@ -324,9 +444,8 @@ async def get_market_opportunities():
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/orchestrator/pause")
-async def pause_orchestrator():
+async def pause_orchestrator(system: ArielSystem = Depends(get_system)):
     """Pause the orchestrator"""
-    system = ArielSystem()
     if not system.running:
         raise HTTPException(status_code=503, detail="System not initialized")
     
@@ -336,7 +455,7 @@ async def pause_orchestrator():
         return {
             "message": "Orchestrator paused",
             "status": "paused",
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": utc_now_iso()
         }
         
     except Exception as e:
@@ -344,9 +463,8 @@ async def pause_orchestrator():
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.post("/orchestrator/resume")
-async def resume_orchestrator():
+async def resume_orchestrator(system: ArielSystem = Depends(get_system)):
     """Resume the orchestrator"""
-    system = ArielSystem()
     if not system.running:
         raise HTTPException(status_code=503, detail="System not initialized")
     
@@ -356,7 +474,7 @@ async def resume_orchestrator():
         return {
             "message": "Orchestrator resumed",
             "status": "active",
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": utc_now_iso()
         }
         
     except Exception as e:
@@ -364,9 +482,8 @@ async def resume_orchestrator():
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/orchestrator/cycle")
-async def run_single_cycle():
+async def run_single_cycle(system: ArielSystem = Depends(get_system)):
     """Run a single orchestrator cycle"""
-    system = ArielSystem()
     if not system.running:
         raise HTTPException(status_code=503, detail="System not initialized")
     
@@ -376,7 +493,7 @@ async def run_single_cycle():
         return {
             "message": "Single cycle completed",
             "cycle_number": system.orchestrator.total_cycles,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": utc_now_iso()
         }
         
     except Exception as e:
@@ -384,9 +501,8 @@ async def run_single_cycle():
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/portfolio")
-async def get_portfolio_performance():
+async def get_portfolio_performance(system: ArielSystem = Depends(get_system)):
     """Get investment portfolio performance"""
-    system = ArielSystem()
     if not system.running:
         raise HTTPException(status_code=503, detail="System not initialized")
     
@@ -395,7 +511,7 @@ async def get_portfolio_performance():
         
         return {
             "portfolio_performance": portfolio_performance,
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": utc_now_iso()
         }
         
     except Exception as e:
@@ -403,12 +519,11 @@ async def get_portfolio_performance():
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/health")
-async def health_check():
+async def health_check(system: ArielSystem = Depends(get_system)):
     """Health check endpoint"""
-    system = ArielSystem()
     return {
         "status": "healthy" if system.running else "initializing",
-        "timestamp": datetime.utcnow().isoformat(),
+        "timestamp": utc_now_iso(),
         "version": "2.0.0"
     }
 
@@ -430,7 +545,7 @@ async def get_db_revenue():
                 "posts": 0,
                 "leads": 0,
                 "conversions": 0,
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": utc_now_iso()
             }
         
         return revenue_data
@@ -450,7 +565,7 @@ async def get_db_ecosystem():
             return {
                 "type": "status",
                 "status": "active",
-                "last_updated": datetime.utcnow().isoformat()
+                "last_updated": utc_now_iso()
             }
         
         return ecosystem_data
@@ -460,13 +575,9 @@ async def get_db_ecosystem():
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/paystack/revenue")
-async def get_revenue(currency: str = "NGN", db=Depends(get_db)):
+async def get_revenue(currency: str = "NGN", db=Depends(require_db)):
     try:
-        if not db._connected:
-            logger.error("Database not connected")
-            raise HTTPException(status_code=503, detail="Database not connected")
-        
-        db_data = await db.find_one("revenue", {"currency": currency})
+        db_data = await cached_find_one(db, "revenue", {"currency": currency})
         if not db_data:
             logger.error(f"Revenue data not found for currency: {currency}")
             raise HTTPException(status_code=404, detail=f"Revenue data not found for currency: {currency}")
@@ -479,13 +590,9 @@ async def get_revenue(currency: str = "NGN", db=Depends(get_db)):
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 @app.get("/ecosystem/status")
-async def get_ecosystem_status(db=Depends(get_db)):
+async def get_ecosystem_status(db=Depends(require_db)):
     try:
-        if not db._connected:
-            logger.error("Database not connected")
-            raise HTTPException(status_code=503, detail="Database not connected")
-        
-        db_status = await db.find_one("ecosystem", {"type": "status"})
+        db_status = await cached_find_one(db, "ecosystem", {"type": "status"})
         if not db_status:
             logger.error("Ecosystem status not found")
             raise HTTPException(status_code=404, detail="Ecosystem status not found")
@@ -498,13 +605,9 @@ async def get_ecosystem_status(db=Depends(get_db)):
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 @app.get("/api/affiliate/metrics")
-async def affiliate_metrics(db=Depends(get_db)):
+async def affiliate_metrics(db=Depends(require_db)):
     try:
-        if not db._connected:
-            logger.error("Database not connected")
-            raise HTTPException(status_code=503, detail="Database not connected")
-        
-        metrics = await db.find_one("affiliate_metrics")
+        metrics = await cached_find_one(db, "affiliate_metrics")
         if not metrics:
             logger.error("Affiliate metrics not found")
             raise HTTPException(status_code=404, detail="Affiliate metrics not found")
@@ -517,9 +620,8 @@ async def affiliate_metrics(db=Depends(get_db)):
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 @app.post("/api/affiliate/optimize")
-async def optimize_affiliate():
+async def optimize_affiliate(system: ArielSystem = Depends(get_system)):
     """Trigger affiliate optimization"""
-    system = ArielSystem()
     if not system.orchestrator:
         # Simulate optimization without orchestrator
         await asyncio.sleep(1)
@@ -530,6 +632,7 @@ async def optimize_affiliate():
         opportunities = await system.orchestrator.quantum.find_opportunities()
         market_trends = await system.orchestrator.neural.analyze_trends()
         await system.orchestrator.campaign_manager.launch_or_optimize(opportunities, market_trends)
+        invalidate_db_cache()
         
         return {"message": "Affiliate optimization triggered successfully!"}
     except Exception as e:
@@ -537,40 +640,38 @@ async def optimize_affiliate():
         raise HTTPException(status_code=500, detail=f"Optimization failed: {str(e)}")
 
 @app.get("/api/neural/metrics")
-async def get_neural_metrics():
+async def get_neural_metrics(system: ArielSystem = Depends(get_system)):
     """Get neural commerce metrics"""
-    system = ArielSystem()
     if system.orchestrator:
         try:
             # Get real neural analysis
             trends = await system.orchestrator.neural.analyze_trends()
+            na_growth, eu_growth, apac_growth = _rng.uniform(_GROWTH_LOW, _GROWTH_HIGH).round(1).tolist()
             return {
                 "globalAnalysis": f"Analyzing {len(trends.get('markets', []))} markets",
                 "automationLevel": int(trends.get('confidence', 0.8) * 100),
                 "marketTrends": [
-                    {"region": "North America", "growth": round(random.uniform(8, 15), 1), "status": trends.get('trend', 'stable')},
-                    {"region": "Europe", "growth": round(random.uniform(5, 12), 1), "status": "stable"},
-                    {"region": "Asia Pacific", "growth": round(random.uniform(10, 20), 1), "status": trends.get('trend', 'bullish')},
+                    {"region": "North America", "growth": na_growth, "status": trends.get('trend', 'stable')},
+                    {"region": "Europe", "growth": eu_growth, "status": "stable"},
+                    {"region": "Asia Pacific", "growth": apac_growth, "status": trends.get('trend', 'bullish')},
                 ]
             }
         except Exception as e:
             logger.error(f"Neural metrics error: {e}")
     
     # Return demo data if orchestrator not available or error
-    return {
-        "globalAnalysis": "Processing 2.3M data points",
-        "automationLevel": random.randint(80, 95),
-        "marketTrends": [
-            {"region": "North America", "growth": 12.5, "status": "bullish"},
-            {"region": "Europe", "growth": 8.3, "status": "stable"},
-            {"region": "Asia Pacific", "growth": 15.7, "status": "bullish"},
-        ]
-    }
+    metrics = _neural_demo_cache.get("demo")
+    if metrics is not None:
+        record_hit("neural.demo_metrics")
+        return metrics
+    
+    record_miss("neural.demo_metrics")
+    metrics = _neural_demo_cache["demo"] = _build_demo_neural_metrics()
+    return metrics
 
 @app.post("/api/neural/optimize")
-async def optimize_neural():
+async def optimize_neural(system: ArielSystem = Depends(get_system)):
     """Trigger neural optimization"""
-    system = ArielSystem()
     if not system.orchestrator:
         await asyncio.sleep(1)
         return {"message": "Neural optimization completed successfully! (Simulated)"}
@@ -584,12 +685,8 @@ async def optimize_neural():
         raise HTTPException(status_code=500, detail=f"Neural optimization failed: {str(e)}")
 
 @app.get("/api/ariel/logs")
-async def ariel_logs(db=Depends(get_db)):
+async def ariel_logs(db=Depends(require_db)):
     try:
-        if not db._connected:
-            logger.error("Database not connected")
-            raise HTTPException(status_code=503, detail="Database not connected")
-        
         logs = await db.to_list("ariel_logs", length=100)
         return {"logs": logs}
     except HTTPException:
@@ -599,16 +696,11 @@ async def ariel_logs(db=Depends(get_db)):
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 @app.get("/api/ariel/status")
-async def ariel_status(db=Depends(get_db)):
+async def ariel_status(db=Depends(require_db), system: ArielSystem = Depends(get_system)):
     try:
-        if not db._connected:
-            logger.error("Database not connected")
-            raise HTTPException(status_code=503, detail="Database not connected")
-        
         status = await db.find_one("ariel_status")
         if not status:
             # Return live status from orchestrator instance if available
-            system = ArielSystem()
             status = await system.get_status()
         
         return status
@@ -620,16 +712,12 @@ async def ariel_status(db=Depends(get_db)):
 
 # Alias route for /ariel/status (no /api prefix)
 @app.get("/ariel/status")
-async def ariel_status_alias(db=Depends(get_db)):
-    return await ariel_status(db)
+async def ariel_status_alias(db=Depends(require_db), system: ArielSystem = Depends(get_system)):
+    return await ariel_status(db, system)
 
 @app.get("/api/quantum/logs")
-async def quantum_logs(db=Depends(get_db)):
+async def quantum_logs(db=Depends(require_db)):
     try:
-        if not db._connected:
-            logger.error("Database not connected")
-            raise HTTPException(status_code=503, detail="Database not connected")
-        
         logs = await db.to_list("quantum_logs", length=100)
         return {"logs": logs}
     except HTTPException:
@@ -639,18 +727,14 @@ async def quantum_logs(db=Depends(get_db)):
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 @app.get("/api/quantum/status")
-async def quantum_status(db=Depends(get_db)):
+async def quantum_status(db=Depends(require_db)):
     try:
-        if not db._connected:
-            logger.error("Database not connected")
-            raise HTTPException(status_code=503, detail="Database not connected")
-        
-        status = await db.find_one("quantum_status")
+        status = await cached_find_one(db, "quantum_status")
         if not status:
             status = {
                 "status": "active",
                 "details": "Quantum research module operational",
-                "timestamp": datetime.utcnow().isoformat()
+                "timestamp": utc_now_iso()
             }
         
         return status
@@ -661,13 +745,9 @@ async def quantum_status(db=Depends(get_db)):
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 @app.get("/api/revenue/comprehensive")
-async def revenue_comprehensive(db=Depends(get_db)):
+async def revenue_comprehensive(db=Depends(require_db)):
     try:
-        if not db._connected:
-            logger.error("Database not connected")
-            raise HTTPException(status_code=503, detail="Database not connected")
-        
-        revenue = await db.find_one("revenue_comprehensive")
+        revenue = await cached_find_one(db, "revenue_comprehensive")
         if not revenue:
             logger.error("Comprehensive revenue data not found")
             raise HTTPException(status_code=404, detail="Comprehensive revenue data not found")
@@ -680,9 +760,8 @@ async def revenue_comprehensive(db=Depends(get_db)):
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
 @app.post("/api/control/pause")
-async def pause_ariel():
+async def pause_ariel(system: ArielSystem = Depends(get_system)):
     """Pause Ariel orchestrator"""
-    system = ArielSystem()
     if not system.orchestrator:
         raise HTTPException(status_code=503, detail="Orchestrator not available")
     
@@ -690,9 +769,8 @@ async def pause_ariel():
     return {"message": "Orchestrator paused successfully"}
 
 @app.post("/api/control/resume")
-async def resume_ariel():
+async def resume_ariel(system: ArielSystem = Depends(get_system)):
     """Resume Ariel orchestrator"""
-    system = ArielSystem()
     if not system.orchestrator:
         raise HTTPException(status_code=503, detail="Orchestrator not available")
     
@@ -700,16 +778,14 @@ async def resume_ariel():
     return {"message": "Orchestrator resumed successfully"}
 
 @app.get("/api/status")
-async def get_system_status():
+async def get_system_status(system: ArielSystem = Depends(get_system)):
     """Get overall system status"""
-    system = ArielSystem()
     status = await system.get_status()
     return status
 
 @app.get("/api/matrix/status")
-async def get_matrix_status():
+async def get_matrix_status(system: ArielSystem = Depends(get_system)):
     """Get ArielMatrix status"""
-    system = ArielSystem()
     if not system.orchestrator or not hasattr(system.orchestrator, 'matrix'):
         return {"error": "ArielMatrix not available"}
     
@@ -721,23 +797,22 @@ async def get_matrix_status():
         raise HTTPException(status_code=500, detail=f"Matrix status failed: {str(e)}")
 
 @app.get("/api/matrix/aggregated-data")
-async def get_aggregated_data(source: str = None):
+async def get_aggregated_data(source: str = None, system: ArielSystem = Depends(get_system)):
     """Get aggregated data from ArielMatrix"""
-    system = ArielSystem()
     if not system.orchestrator or not hasattr(system.orchestrator, 'matrix'):
         return {"error": "ArielMatrix not available"}
     
     try:
         data = system.orchestrator.matrix.aggregator.get_aggregated_data(source)
-        return {"data": data, "count": len(data)}
+        # Returned as a response so the large payload skips jsonable_encoder
+        return ORJSONResponse(content={"data": data, "count": len(data)})
     except Exception as e:
         logger.error(f"Aggregated data error: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to get aggregated data: {str(e)}")
 
 @app.get("/api/matrix/api-summary")
-async def get_api_summary():
+async def get_api_summary(system: ArielSystem = Depends(get_system)):
     """Get API management summary"""
-    system = ArielSystem()
     if not system.orchestrator or not hasattr(system.orchestrator, 'matrix'):
         return {"error": "ArielMatrix not available"}
     
@@ -749,23 +824,22 @@ async def get_api_summary():
         raise HTTPException(status_code=500, detail=f"Failed to get API summary: {str(e)}")
 
 @app.post("/api/matrix/sync-apis")
-async def sync_matrix_apis():
+async def sync_matrix_apis(system: ArielSystem = Depends(get_system)):
     """Trigger API synchronization"""
-    system = ArielSystem()
     if not system.orchestrator or not hasattr(system.orchestrator, 'matrix'):
         raise HTTPException(status_code=503, detail="ArielMatrix not available")
     
     try:
         await system.orchestrator.matrix.api_manager.sync_apis()
+        invalidate_db_cache()
         return {"message": "API synchronization completed successfully"}
     except Exception as e:
         logger.error(f"API sync error: {e}")
         raise HTTPException(status_code=500, detail=f"API sync failed: {str(e)}")
 
 @app.post("/api/matrix/aggregate")
-async def trigger_aggregation(source: str = None):
+async def trigger_aggregation(source: str = None, system: ArielSystem = Depends(get_system)):
     """Trigger data aggregation"""
-    system = ArielSystem()
     if not system.orchestrator or not hasattr(system.orchestrator, 'matrix'):
         raise HTTPException(status_code=503, detail="ArielMatrix not available")
     
@@ -778,14 +852,14 @@ async def trigger_aggregation(source: str = None):
 
 @app.exception_handler(404)
 async def not_found_handler(request, exc):
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=404,
         content={"message": "Endpoint not found"}
     )
 
 @app.exception_handler(500)
 async def server_error_handler(request, exc):
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={"message": "Internal server error"}
     )
@@ -799,4 +873,7 @@ if __name__ == "__main__":
     print("=" * 80)
     
     # Run the system
-    asyncio.run(main())
+    if uvloop:
+        uvloop.run(main())
+    else:
+        asyncio.run(main())
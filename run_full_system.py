@@ -70,25 +70,30 @@ async def main():
     
     choice = input("Enter your choice (1-4): ").strip()
     
-    if choice == "1":
-        logger.info("Starting Full System Mode...")
-        # Run API server (which includes Ariel in background)
-        run_api_server()
+    try:
+        if choice == "1":
+            logger.info("Starting Full System Mode...")
+            # Run API server (which includes Ariel in background)
+            run_api_server()
         
-    elif choice == "2":
-        logger.info("Starting API Server Only...")
-        run_api_server()
+        elif choice == "2":
+            logger.info("Starting API Server Only...")
+            run_api_server()
         
-    elif choice == "3":
-        logger.info("Starting Ariel Orchestrator Only...")
-        await run_ariel_standalone()
+        elif choice == "3":
+            logger.info("Starting Ariel Orchestrator Only...")
+            await run_ariel_standalone()
         
-    elif choice == "4":
-        logger.info("Running Database Test...")
-        await test_database()
+        elif choice == "4":
+            logger.info("Running Database Test...")
+            await test_database()
         
-    else:
-        logger.error("Invalid choice. Exiting.")
+        else:
+            logger.error("Invalid choice. Exiting.")
+    finally:
+        # Write buffered append() rows before the process exits
+        from database import close_database
+        await close_database()
 
 async def test_database():
     """Test database functionality"""
@@ -98,14 +103,15 @@ async def test_database():
         from database import get_db
         db = await get_db()
         
-        # Test insert
+        # Test insert; ariel_logs is append-only, so it goes through the
+        # buffered append path and is flushed by the read below
         test_data = {
-            "test": True,
+            "activity": "database_test",
             "timestamp": "2025-01-02T11:46:23Z",
-            "message": "Database test successful"
+            "data": {"test": True, "message": "Database test successful"}
         }
         
-        await db.insert_one("ariel_logs", test_data)
+        await db.append("ariel_logs", test_data)
         logger.info("✅ Insert test passed")
         
         # Test find
